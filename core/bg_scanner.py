@@ -8,14 +8,75 @@ import os
 import time
 import json
 import multiprocessing as mp
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 
 # Windows multiprocessing protection
 if __name__ == '__main__':
     mp.freeze_support()
 
 
+def _scan_directory(dir_path: str, is_ignored) -> Tuple[List[str], List[Tuple[str, int]]]:
+    """
+    List one directory with a single os.scandir pass.
+    Returns (subdirectories, [(file_path, file_size), ...]). Sizes come from
+    DirEntry.stat(), which reuses the data scandir already fetched where the OS provides it.
+    """
+    subdirs = []
+    files = []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    # Like os.walk, symlinked directories are not descended into
+                    if not entry.is_symlink() and not is_ignored(entry.name):
+                        subdirs.append(entry.path)
+                    continue
+                files.append((entry.path, entry.stat().st_size))
+            except OSError:
+                continue  # Broken symlink or entry removed mid-scan
+    # scandir order depends on the filesystem; sorted output is the same on every run
+    files.sort()
+    return subdirs, files
+
+
+# Minimum seconds between progress messages sent to the main process
+PROGRESS_MIN_INTERVAL = 0.05
+
+# Directory listing is IO-bound, so sibling folders are listed concurrently
+WALK_MAX_WORKERS = 8
+
+# Files are read on a thread pool and tokenized with one encode_batch call per batch
+TOKENIZE_BATCH_SIZE = 64
+TOKENIZE_READ_WORKERS = 8
+
+
+def _walk_parallel(folder_path: str, is_ignored):
+    """
+    Breadth-first walk that lists each level's directories on a thread pool.
+    Yields (directory, [(file_path, file_size), ...]) level by level, in sorted
+    path order within a level, so the item order is the same on every run.
+    An unreadable scan root raises; unreadable subdirectories are skipped.
+    """
+    with ThreadPoolExecutor(max_workers=WALK_MAX_WORKERS) as executor:
+        level = [folder_path]
+        while level:
+            level.sort()
+            # All listings of the level run at once; results are taken in submission order
+            futures = [(path, executor.submit(_scan_directory, path, is_ignored)) for path in level]
+            level = []
+            for root, future in futures:
+                try:
+                    subdirs, files = future.result()
+                except OSError as e:
+                    if root == folder_path:
+                        raise
+                    print(f"[BG_SCANNER] ⚠️ Cannot read directory {root}: {e}")
+                    continue
+                level.extend(subdirs)
+                yield root, files
+
+
 def background_scanner_process(folder_path: str, settings: Dict, result_queue: mp.Queue, control_queue: mp.Queue):
     """
     Background scanner process that runs completely isolated from the main UI.
@@ -33,9 +94,12 @@ def background_scanner_process(folder_path: str, settings: Dict, result_queue: m
     try:
         # Import modules inside the process to avoid conflicts
         import sys
-        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+        # The worker process runs many scans; add the project root only once
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        if project_root not in sys.path:
+            sys.path.append(project_root)
         
-        from core.helpers import calculate_tokens, MAX_FILE_SIZE_BYTES
+        from core.helpers import calculate_tokens_batch, compile_ignore_matcher, MAX_FILE_SIZE_BYTES
         from core.smart_file_handler import SmartFileHandler
         
         # Scan directory structure first (fast)
@@ -43,48 +107,38 @@ def background_scanner_process(folder_path: str, settings: Dict, result_queue: m
         structure_start = time.time()
         
         items = []
-        file_paths_to_tokenize = []
+        file_paths_to_tokenize = []  # (index into items, file_path, file_size)
         
-        # Walk directory tree
+        # Walk directory tree with os.scandir (one stat per file, no exists/getsize pair)
         walk_start = time.time()
         files_processed_count = 0
-        for root, dirs, files in os.walk(folder_path):
-            # Filter ignored directories
-            if settings.get('ignore_folders'):
-                dirs[:] = [d for d in dirs if d not in settings['ignore_folders']]
-            
+        # Compile ignore rules once (exact names + globs) instead of per directory
+        is_ignored = compile_ignore_matcher(settings.get('ignore_folders'))
+        for root, files in _walk_parallel(folder_path, is_ignored):
             # Add directory items
             if root != folder_path:  # Skip root directory itself
-                rel_path = os.path.relpath(root, folder_path)
                 items.append((root, True, True, "", 0))  # (path, is_dir, is_valid, reason, token_count)
             
             # Add file items
-            for file in files:
+            for file_path, file_size in files:
                 files_processed_count += 1
                 if files_processed_count % 1000 == 0:
                     print(f"[BG_SCANNER] ⏱️ Processed {files_processed_count} files in structure scan...")
                 
-                file_path = os.path.join(root, file)
-                
                 try:
-                    # Basic file validation
-                    if not os.path.exists(file_path):
-                        continue
-                    
-                    file_size = os.path.getsize(file_path)
-                    
                     # Use smart file handler to determine strategy
                     strategy = SmartFileHandler.get_tokenization_strategy(file_path, file_size)
                     
                     if strategy == 'skip':
                         # File is skipped - add with 0 tokens and reason
                         _, reason = SmartFileHandler.get_file_display_info(file_path, file_size, strategy)
-                        items.append((file_path, False, True, reason, 0))
+                        # Reasons repeat across thousands of files; share one string per reason
+                        items.append((file_path, False, True, sys.intern(reason), 0))
                         # print(f"[BG_SCANNER] ⏭️ Skipped {os.path.basename(file_path)}: {reason}")
                     else:
                         # File will be tokenized - add with -1 (loading) for now
+                        file_paths_to_tokenize.append((len(items), file_path, file_size))
                         items.append((file_path, False, True, "", -1))
-                        file_paths_to_tokenize.append(file_path)
                         # print(f"[BG_SCANNER] 📝 Queued for tokenization: {os.path.basename(file_path)} ({file_size//1024}KB)")
                 
                 except Exception as e:
@@ -92,7 +146,7 @@ def background_scanner_process(folder_path: str, settings: Dict, result_queue: m
                     items.append((file_path, False, False, f"Error: {str(e)[:50]}", 0))
         
         walk_time = (time.time() - walk_start) * 1000
-        print(f"[BG_SCANNER] 🚶 os.walk completed in {walk_time:.2f}ms")
+        print(f"[BG_SCANNER] 🚶 Directory walk completed in {walk_time:.2f}ms")
 
         structure_time = (time.time() - structure_start) * 1000
         print(f"[BG_SCANNER] ✅ Directory structure scan completed in {structure_time:.2f}ms")
@@ -113,68 +167,71 @@ def background_scanner_process(folder_path: str, settings: Dict, result_queue: m
             print(f"[BG_SCANNER] ⚠️ Main process busy - continuing without sending structure")
         
         # Start tokenization in background (completely independent)
+        completed_count = 0
         if file_paths_to_tokenize:
+            # Progress is coalesced: at most one queue message per interval
+            last_progress_time = time.monotonic()
             print(f"[BG_SCANNER] 🧮 Starting background tokenization of {len(file_paths_to_tokenize)} files...")
             tokenization_start = time.time()
             
-            completed_count = 0
-            for file_path in file_paths_to_tokenize:
-                # Check for stop command (non-blocking)
-                try:
-                    if not control_queue.empty():
-                        command = control_queue.get_nowait()
-                        if command == 'stop':
-                            print(f"[BG_SCANNER] 🛑 Stop command received, terminating...")
-                            break
-                except:
-                    pass  # No command, continue
-                
-                try:
-                    # Detailed timing for each file
-                    file_start = time.time()
-                    file_name = os.path.basename(file_path)
-                    file_size = os.path.getsize(file_path)
-                    print(f"[BG_SCANNER] 🔄 START: {file_name} ({file_size//1024}KB) - {completed_count+1}/{len(file_paths_to_tokenize)}")
-                    
-                    # Tokenize file
-                    with open(file_path, 'rb') as f:
-                        raw_bytes = f.read(MAX_FILE_SIZE_BYTES + 1)
-                    
-                    content = raw_bytes[:MAX_FILE_SIZE_BYTES].decode('utf-8', errors='replace')
-                    token_count = calculate_tokens(content)
-                    
-                    # Update items list
-                    for i, (path, is_dir, is_valid, reason, old_count) in enumerate(items):
-                        if path == file_path and not is_dir:
-                            items[i] = (path, is_dir, is_valid, reason, token_count)
-                            break
-                    
-                    completed_count += 1
-                    file_time = (time.time() - file_start) * 1000
-                    print(f"[BG_SCANNER] ✅ END: {file_name}: {token_count} tokens in {file_time:.2f}ms ({completed_count}/{len(file_paths_to_tokenize)})")
-                    
+            def read_head(file_path):
+                # Only the first MAX_FILE_SIZE_BYTES are tokenized
+                with open(file_path, 'rb') as f:
+                    raw_bytes = f.read(MAX_FILE_SIZE_BYTES + 1)
+                return raw_bytes[:MAX_FILE_SIZE_BYTES].decode('utf-8', errors='replace')
+
+            with ThreadPoolExecutor(max_workers=TOKENIZE_READ_WORKERS) as executor:
+                for batch_start in range(0, len(file_paths_to_tokenize), TOKENIZE_BATCH_SIZE):
+                    # Check for stop command (non-blocking)
+                    try:
+                        if not control_queue.empty():
+                            command = control_queue.get_nowait()
+                            if command == 'stop':
+                                print(f"[BG_SCANNER] 🛑 Stop command received, terminating...")
+                                break
+                    except:
+                        pass  # No command, continue
+
+                    batch = file_paths_to_tokenize[batch_start:batch_start + TOKENIZE_BATCH_SIZE]
+                    batch_time = time.time()
+
+                    # Read the batch on worker threads (file I/O releases the GIL)
+                    read_futures = [executor.submit(read_head, file_path) for _, file_path, _ in batch]
+                    readable = []  # (item_index, file_path, content)
+                    for (item_index, file_path, _), future in zip(batch, read_futures):
+                        try:
+                            readable.append((item_index, file_path, future.result()))
+                        except Exception as e:
+                            print(f"[BG_SCANNER] ❌ Error tokenizing {file_path}: {e}")
+                            # Update with error
+                            items[item_index] = (file_path, False, False, f"Error: {str(e)[:50]}", 0)
+                            completed_count += 1
+
+                    # One batched encode; tiktoken spreads it across threads
+                    token_counts = calculate_tokens_batch([content for _, _, content in readable])
+                    for (item_index, file_path, _), token_count in zip(readable, token_counts):
+                        # Update items list in place via the index recorded during the walk
+                        path, is_dir, is_valid, reason, _ = items[item_index]
+                        items[item_index] = (path, is_dir, is_valid, reason, token_count)
+                        completed_count += 1
+
+                    batch_ms = (time.time() - batch_time) * 1000
+                    print(f"[BG_SCANNER] ✅ Tokenized {len(batch)} files in {batch_ms:.2f}ms ({completed_count}/{len(file_paths_to_tokenize)})")
+
                     # Send periodic updates (OPTIONAL - main process can ignore)
-                    if completed_count % 10 == 0:  # Every 10 files
+                    if readable and time.monotonic() - last_progress_time >= PROGRESS_MIN_INTERVAL:
+                        last_progress_time = time.monotonic()
                         try:
                             result_queue.put({
                                 'type': 'progress_update',
                                 'completed': completed_count,
                                 'total': len(file_paths_to_tokenize),
-                                'latest_file': file_path,
-                                'latest_tokens': token_count,
+                                'latest_file': readable[-1][1],
+                                'latest_tokens': token_counts[-1],
                                 'timestamp': time.time()
                             }, timeout=0.1)  # Very short timeout
                         except:
                             pass  # Main process busy, continue
-                
-                except Exception as e:
-                    print(f"[BG_SCANNER] ❌ Error tokenizing {file_path}: {e}")
-                    # Update with error
-                    for i, (path, is_dir, is_valid, reason, old_count) in enumerate(items):
-                        if path == file_path and not is_dir:
-                            items[i] = (path, is_dir, False, f"Error: {str(e)[:50]}", 0)
-                            break
-                    completed_count += 1
             
             tokenization_time = (time.time() - tokenization_start) * 1000
             print(f"[BG_SCANNER] 🎉 Tokenization completed in {tokenization_time:.2f}ms")
@@ -205,3 +262,22 @@ def background_scanner_process(folder_path: str, settings: Dict, result_queue: m
         except:
             pass
 
+
+def background_scanner_worker(task_queue: mp.Queue, result_queue: mp.Queue, control_queue: mp.Queue):
+    """
+    Long-lived scanner process that runs one scan per (folder_path, settings, scan_id) task.
+    Reusing the process skips interpreter startup and imports for every rescan.
+    After each task a 'worker_idle' message carrying the scan_id is posted, even if
+    the scan's own results could not be sent. A None task shuts the worker down.
+    """
+    print(f"[BG_SCANNER] 🔁 Scanner worker started (PID: {os.getpid()})")
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        folder_path, settings, scan_id = task
+        try:
+            background_scanner_process(folder_path, settings, result_queue, control_queue)
+        finally:
+            result_queue.put({'type': 'worker_idle', 'scan_id': scan_id, 'timestamp': time.time()})
+    print(f"[BG_SCANNER] 👋 Scanner worker exiting")
@@ -0,0 +1,68 @@
+# --- File: file_reader.py ---
+"""
+File reading helpers for token counting.
+Large files and formats with a near-constant bytes/token ratio are estimated
+from their size instead of being decoded and BPE-encoded.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+# Files above this size get a bytes/4 token estimate instead of a full read
+TOKEN_READ_SIZE_LIMIT = 1_000_000
+
+# Machine-generated formats where bytes/4 is close to the real token count
+APPROX_TOKEN_SUFFIXES = ('.log', '.min.js', '.csv', '.jsonl', '.lock', '.map')
+APPROXIMATE_TOKEN_COUNTS = True  # Set False to always run the exact tokenizer
+
+# Threads used to read several files at once; file reads release the GIL
+READ_MAX_WORKERS = 8
+
+
+def estimate_tokens(path: str, size: int) -> Optional[int]:
+    """Return a bytes/4 token estimate for approximable files, or None if it needs exact counting."""
+    if APPROXIMATE_TOKEN_COUNTS and path.lower().endswith(APPROX_TOKEN_SUFFIXES):
+        return size // 4
+    return None
+
+
+def read_for_tokens(path: str, size_limit: int = TOKEN_READ_SIZE_LIMIT) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Read a file for tokenization.
+    Returns (text, None) for files within size_limit, or (None, estimated_tokens)
+    for larger or approximable files. Raises OSError if the file cannot be read.
+    """
+    st = os.stat(path)
+    if st.st_size > size_limit:
+        return None, st.st_size // 4
+    estimated_tokens = estimate_tokens(path, st.st_size)
+    if estimated_tokens is not None:
+        return None, estimated_tokens
+
+    # The file may have changed since the stat, so the cutoff goes by the bytes actually read
+    with open(path, 'rb') as f:
+        data = f.read(size_limit + 1)
+    if len(data) > size_limit:
+        return None, len(data) // 4
+    return data.decode('utf-8', 'replace'), None
+
+
+def _read_or_empty(path: str) -> Tuple[Optional[str], Optional[int]]:
+    """read_for_tokens() that treats an unreadable or vanished file as empty."""
+    try:
+        return read_for_tokens(path)
+    except OSError:
+        return None, 0
+
+
+def read_many_for_tokens(paths: Sequence[str], max_workers: int = READ_MAX_WORKERS) -> List[Tuple[Optional[str], Optional[int]]]:
+    """
+    Read several files for tokenization concurrently.
+    Returns one read_for_tokens() result per path, in order. Files that cannot
+    be read yield (None, 0).
+    """
+    if len(paths) < 2:
+        return [_read_or_empty(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        return list(executor.map(_read_or_empty, paths))
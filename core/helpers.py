@@ -3,10 +3,15 @@
 MAX_FILE_SIZE_KB = 200
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_KB * 1024
 SCAN_BATCH_SIZE = 100
+import fnmatch
 import os
 import pathlib
+import re
+import threading
 import traceback
 
+from .file_reader import read_for_tokens
+
 # --- magic import ---
 # HACK: Temporarily disable python-magic to avoid libmagic dependency issues
 MAGIC_AVAILABLE = False
@@ -22,6 +27,14 @@ MAGIC_AVAILABLE = False
 
 # --- tiktoken import ---
 _tokenizer = None
+_encodings = {}  # encoding name -> tiktoken Encoding, built once per process
+
+# Token counts of recently seen contents, keyed by (encoding, length, hash(text)).
+# Autosave/formatter floods re-submit identical content; a hit skips the BPE encode.
+_token_count_cache = {}
+TOKEN_COUNT_CACHE_SIZE = 50_000
+# The aggregation thread and the GUI thread both fill the cache
+_token_count_cache_lock = threading.Lock()
 
 try:
     import tiktoken
@@ -35,10 +48,19 @@ def get_tokenizer():
     """Returns a singleton tokenizer instance."""
     global _tokenizer
     if TIKTOKEN_AVAILABLE and _tokenizer is None:
-        _tokenizer = tiktoken.get_encoding("cl100k_base")
+        _tokenizer = _get_encoding("cl100k_base")
     return _tokenizer
 
 
+def _get_encoding(encoding_name):
+    """Returns a cached tiktoken encoding so BPE setup runs once per process."""
+    encoding = _encodings.get(encoding_name)
+    if encoding is None:
+        encoding = tiktoken.get_encoding(encoding_name)
+        _encodings[encoding_name] = encoding
+    return encoding
+
+
 BINARY_CHECK_CHUNK_SIZE = 1024 # For is_text_file fallback check
 TOKEN_ENCODING_NAME = "cl100k_base"
 
@@ -93,16 +115,72 @@ def is_text_file(file_path):
         return False
 
 
+def compile_ignore_matcher(patterns):
+    """
+    Builds a fast name -> bool predicate for folder/file ignore rules.
+    Exact names are checked with a frozenset lookup and glob patterns are
+    compiled once into a single regex, so each check costs the same no
+    matter how many rules there are. Like fnmatch.fnmatch, patterns and names
+    go through os.path.normcase, so matching is case-insensitive on Windows.
+    """
+    normcase = os.path.normcase
+    patterns = [normcase(p) for p in (patterns or ()) if p]
+    exact = frozenset(p for p in patterns if not any(c in p for c in '*?['))
+    globs = [p for p in patterns if p not in exact]
+    if not globs:
+        return lambda name: normcase(name) in exact
+
+    glob_match = re.compile('|'.join(fnmatch.translate(p) for p in globs)).match
+    def matches(name):
+        name = normcase(name)
+        return name in exact or glob_match(name) is not None
+    return matches
+
+
+def _cache_token_count(key, count):
+    """Stores a token count, evicting the oldest entry once the cache is full."""
+    with _token_count_cache_lock:
+        if len(_token_count_cache) >= TOKEN_COUNT_CACHE_SIZE:
+            _token_count_cache.pop(next(iter(_token_count_cache)), None)
+        _token_count_cache[key] = count
+
+
 def calculate_tokens(text: str, encoding_name: str = TOKEN_ENCODING_NAME) -> int:
     """Calculates the number of tokens in a string using tiktoken."""
     if not TIKTOKEN_AVAILABLE or not text: return 0
+    key = (encoding_name, len(text), hash(text))
+    cached = _token_count_cache.get(key)
+    if cached is not None:
+        return cached
     try:
-        encoding = tiktoken.get_encoding(encoding_name)
+        encoding = _get_encoding(encoding_name)
         tokens = encoding.encode(text, disallowed_special=()) # Allow special tokens for more accurate count
-        return len(tokens)
     except Exception as e:
         print(f"Warning: Could not calculate tokens using '{encoding_name}': {e}")
         return 0
+    _cache_token_count(key, len(tokens))
+    return len(tokens)
+
+
+def calculate_tokens_batch(texts, encoding_name: str = TOKEN_ENCODING_NAME) -> list:
+    """Calculates token counts for several strings with one batched tiktoken call."""
+    if not TIKTOKEN_AVAILABLE or not texts: return [0] * len(texts)
+    keys = [(encoding_name, len(text), hash(text)) for text in texts]
+    counts = [_token_count_cache.get(key) for key in keys]
+    missing = [i for i, count in enumerate(counts) if count is None]
+    if not missing:
+        return counts
+    try:
+        encoding = _get_encoding(encoding_name)
+        token_lists = encoding.encode_batch([texts[i] for i in missing], num_threads=os.cpu_count() or 1,
+                                            disallowed_special=())
+    except Exception as e:
+        print(f"Warning: Batch token calculation failed, falling back to per-text: {e}")
+        return [calculate_tokens(text, encoding_name) for text in texts]
+    for i, tokens in zip(missing, token_lists):
+        counts[i] = len(tokens)
+        _cache_token_count(keys[i], counts[i])
+    return counts
 
 
 def count_tokens_in_file(file_path: str) -> int:
@@ -110,10 +188,12 @@ def count_tokens_in_file(file_path: str) -> int:
 
     Uses UTF-8 with replacement for decoding errors and returns 0 on any
     exception to provide a safe, centralized file token counting helper.
+    Very large files get a size-based estimate instead of a full read.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        content, estimated_tokens = read_for_tokens(file_path)
+        if content is None:
+            return estimated_tokens
         return calculate_tokens(content)
     except Exception as e:
         print(f"Warning: Error counting tokens for '{file_path}': {e}")
@@ -2,10 +2,54 @@
 
 """Data model and persistence logic for selection groups."""
 
+import logging
 import os
 import time
+from functools import lru_cache
 from typing import Dict, Set, List, Union
 
+log = logging.getLogger(__name__)
+
+
+def _is_clean_relative(path: str) -> bool:
+    """True for a relative, forward-slash path that normpath would leave unchanged."""
+    if not path or '\\' in path or '//' in path or path.endswith('/') or os.path.isabs(path):
+        return False
+    wrapped = f"/{path}/"
+    return '/./' not in wrapped and '/../' not in wrapped
+
+
+@lru_cache(maxsize=64)
+def _root_prefix(workspace_root: str) -> str:
+    """Normalized forward-slash workspace root with a trailing slash."""
+    return os.path.normpath(workspace_root).replace('\\', '/').rstrip('/') + '/'
+
+
+@lru_cache(maxsize=16384)
+def _absolute_path(workspace_root: str, path: str) -> str:
+    """Absolute form of one stored path; memoized so repeated group switches skip the work."""
+    if _is_clean_relative(path):
+        return _root_prefix(workspace_root) + path
+    return os.path.normpath(os.path.join(workspace_root, path)).replace('\\', '/')
+
+
+def clear_path_cache() -> None:
+    """Drops memoized path conversions, e.g. when switching to another workspace."""
+    _absolute_path.cache_clear()
+    _root_prefix.cache_clear()
+
+
+def to_absolute_paths(paths, workspace_root: str = None) -> List[str]:
+    """
+    Converts stored group paths to normalized absolute paths with forward slashes.
+    
+    Clean relative paths only get the root prefix; anything else
+    goes through os.path.join/normpath. Order is preserved.
+    """
+    if not workspace_root:
+        return [os.path.normpath(p).replace('\\', '/') for p in paths]
+    return [_absolute_path(workspace_root, path) for path in paths]
+
 
 def load_groups(workspace_dict: dict) -> dict:
     """
@@ -20,15 +64,7 @@ def load_groups(workspace_dict: dict) -> dict:
     # Convert relative paths to absolute when loading
     if workspace_root and groups:
         for group_name, group_data in groups.items():
-            absolute_paths = []
-            for rel_path in group_data.get("checked_paths", []):
-                try:
-                    abs_path = os.path.normpath(os.path.join(workspace_root, rel_path)).replace('\\', '/')
-                    absolute_paths.append(abs_path)
-                except Exception:
-                    # Fallback to original path if conversion fails
-                    absolute_paths.append(rel_path)
-            group_data["checked_paths"] = absolute_paths
+            group_data["checked_paths"] = to_absolute_paths(group_data.get("checked_paths", []), workspace_root)
     
     # Ensure Default group exists
     if not groups:
@@ -55,7 +91,13 @@ def save_group(workspace_dict: dict, name: str, description: str, paths: Union[S
     # Convert paths to relative if possible
     relative_paths = []
     if workspace_root:
+        # Paths under the root only need the root prefix sliced off
+        root_prefix = os.path.normpath(workspace_root).replace('\\', '/').rstrip('/') + '/'
         for path in paths:
+            norm_path = path.replace('\\', '/')
+            if norm_path.startswith(root_prefix) and '/..' not in norm_path and '/./' not in norm_path:
+                relative_paths.append(norm_path[len(root_prefix):])
+                continue
             try:
                 rel_path = os.path.relpath(path, workspace_root).replace('\\', '/')
                 # Only use relative path if it doesn't start with .. (outside workspace)
@@ -82,7 +124,7 @@ def save_group(workspace_dict: dict, name: str, description: str, paths: Union[S
         "last_updated": time.time(),
     }
     
-    print(f"[SELECTION] Saved group '{name}' with {len(relative_paths)} paths (relative to workspace) and timestamp")
+    log.debug("[SELECTION] Saved group '%s' with %d paths (relative to workspace) and timestamp", name, len(relative_paths))
 
 
 def delete_group(workspace_dict: dict, name: str) -> None:
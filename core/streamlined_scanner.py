@@ -1,6 +1,7 @@
 """
 Streamlined scanner that uses ONLY the efficient background_scanner_process.
 No threads, no complex initialization - just fast file listing and tokenization.
+The scanner process is kept alive between scans and reused for the next one.
 """
 
 import multiprocessing as mp
@@ -9,7 +10,7 @@ import os
 from typing import Dict, List, Tuple, Optional
 from PySide6.QtCore import QObject, Signal, QTimer
 
-from .bg_scanner import background_scanner_process
+from .bg_scanner import background_scanner_worker
 
 
 class StreamlinedScanner(QObject):
@@ -27,13 +28,16 @@ class StreamlinedScanner(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_process = None
+        self.task_queue = None
         self.result_queue = None
         self.control_queue = None
+        self.scan_running = False  # True while the worker is busy with a scan
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self._check_results)
         self.update_timer.setSingleShot(False)
         self.scan_completed = False  # Flag to prevent processing after completion
         self.scan_start_time = None  # Track scan timing
+        self.scan_id = 0  # Matches the worker's 'worker_idle' message to the scan it ended
         
     def start_scan(self, folder_path: str, settings: Dict) -> bool:
         """
@@ -53,23 +57,34 @@ class StreamlinedScanner(QObject):
         self.scan_completed = False
         
         try:
-            # Create multiprocessing queues
-            queue_time = (time.time() - self.scan_start_time) * 1000
-            self.result_queue = mp.Queue()
-            self.control_queue = mp.Queue()
-            print(f"[STREAMLINED] 📋 Queues created (T+{queue_time:.2f}ms)")
-            
-            # Start the efficient background scanner process
-            process_create_time = (time.time() - self.scan_start_time) * 1000
-            self.current_process = mp.Process(
-                target=background_scanner_process,
-                args=(folder_path, settings, self.result_queue, self.control_queue)
-            )
-            print(f"[STREAMLINED] 🏠 Process created (T+{process_create_time:.2f}ms)")
-            
-            self.current_process.start()
-            process_start_time = (time.time() - self.scan_start_time) * 1000
-            print(f"[STREAMLINED] ✅ Background process started (PID: {self.current_process.pid}) (T+{process_start_time:.2f}ms)")
+            if self.current_process and self.current_process.is_alive():
+                # Idle worker from a previous scan - reuse it
+                print(f"[STREAMLINED] ♻️ Reusing scanner process (PID: {self.current_process.pid})")
+            else:
+                # Create multiprocessing queues
+                queue_time = (time.time() - self.scan_start_time) * 1000
+                self.task_queue = mp.Queue()
+                self.result_queue = mp.Queue()
+                self.control_queue = mp.Queue()
+                print(f"[STREAMLINED] 📋 Queues created (T+{queue_time:.2f}ms)")
+                
+                # Start the efficient background scanner process
+                process_create_time = (time.time() - self.scan_start_time) * 1000
+                self.current_process = mp.Process(
+                    target=background_scanner_worker,
+                    args=(self.task_queue, self.result_queue, self.control_queue),
+                    # An idle worker waits for tasks forever; it must not keep the app from exiting
+                    daemon=True
+                )
+                print(f"[STREAMLINED] 🏠 Process created (T+{process_create_time:.2f}ms)")
+                
+                self.current_process.start()
+                process_start_time = (time.time() - self.scan_start_time) * 1000
+                print(f"[STREAMLINED] ✅ Background process started (PID: {self.current_process.pid}) (T+{process_start_time:.2f}ms)")
+            
+            self.scan_id += 1
+            self.task_queue.put((folder_path, settings, self.scan_id))
+            self.scan_running = True
             
             # Start checking for results
             timer_start_time = (time.time() - self.scan_start_time) * 1000
@@ -92,7 +107,12 @@ class StreamlinedScanner(QObject):
             return False
     
     def stop_scan(self):
-        """Stop any running scan."""
+        """Stop any running scan. An idle worker process is kept for the next scan."""
+        if self.current_process and self.current_process.is_alive() and not self.scan_running:
+            if self.update_timer.isActive():
+                self.update_timer.stop()
+            return
+
         if self.current_process and self.current_process.is_alive():
             print(f"[STREAMLINED] 🛑 Stopping scan process...")
             
@@ -120,8 +140,10 @@ class StreamlinedScanner(QObject):
         
         # Clean up
         self.current_process = None
+        self.task_queue = None
         self.result_queue = None
         self.control_queue = None
+        self.scan_running = False
     
     def _check_results(self):
         """Check for results from background process."""
@@ -141,8 +163,8 @@ class StreamlinedScanner(QObject):
 
                 result_type = result.get('type', 'unknown')
                 
-                # Only process scan_complete and structure_complete - skip progress updates
-                if result_type in ['scan_complete', 'structure_complete']:
+                # Process results, errors and the worker's end-of-scan marker - progress is handled below
+                if result_type in ['scan_complete', 'structure_complete', 'error', 'worker_idle']:
                     process_start = time.time()
                     self._process_result(result)
                     process_time = (time.time() - process_start) * 1000
@@ -166,6 +188,9 @@ class StreamlinedScanner(QObject):
             if not self.scan_completed:  # Only print if we haven't already stopped
                 print(f"[STREAMLINED] 🏁 Background process completed")
                 self.update_timer.stop()
+                if self.scan_running:
+                    self.scan_running = False
+                    self.scan_error.emit("Scanner process exited before the scan completed")
     
     def _process_result(self, result: Dict):
         """Process a single result from the background scanner."""
@@ -200,6 +225,7 @@ class StreamlinedScanner(QObject):
             
             # Set completion flag to stop further processing
             self.scan_completed = True
+            self.scan_running = False  # Worker is idle again and can take the next scan
             flag_time = (time.time() - self.scan_start_time) * 1000
             print(f"[STREAMLINED] 🏴 Completion flag set (T+{flag_time:.2f}ms)")
             
@@ -222,9 +248,25 @@ class StreamlinedScanner(QObject):
             # Error occurred
             error = result.get('error', 'Unknown error')
             print(f"[STREAMLINED] ❌ Scan error: {error}")
+            self.scan_running = False
             self.scan_error.emit(error)
             self.update_timer.stop()
+
+        elif result_type == 'worker_idle':
+            # The worker finished this scan; anything else it sent has been read by now
+            if result.get('scan_id') == self.scan_id and self.scan_running:
+                print(f"[STREAMLINED] ⚠️ Scanner finished without sending results")
+                self.scan_running = False
+                self.update_timer.stop()
+                self.scan_error.emit("Scan finished without results")
     
     def cleanup(self):
-        """Clean up resources."""
+        """Clean up resources, shutting down the scanner process."""
+        if self.current_process and self.current_process.is_alive() and not self.scan_running:
+            try:
+                self.task_queue.put(None, timeout=0.1)
+                self.current_process.join(timeout=1.0)
+            except Exception:
+                pass
+        self.scan_running = True  # Make stop_scan() terminate anything still alive
         self.stop_scan()
@@ -1,4 +1,4 @@
-import tiktoken
+from .helpers import get_tokenizer
 
 def count_tokens(file_path):
     """Counts the number of tokens in a file."""
@@ -6,7 +6,10 @@ def count_tokens(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             text = f.read()
         # Using 'cl100k_base' for gpt-4, gpt-3.5-turbo, and text-embedding-ada-002
-        encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_tokenizer()
+        if encoding is None:
+            # tiktoken is not installed
+            return 0
         return len(encoding.encode(text))
     except FileNotFoundError:
         return 0
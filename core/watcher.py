@@ -1,21 +1,49 @@
-import time
 import threading
 import os
 import queue
-from watchdog.observers.polling import PollingObserver as Observer
-import fnmatch
+import time
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler, FileSystemMovedEvent
 from PySide6.QtCore import QObject, Signal, QTimer
-from .helpers import count_tokens_in_file
+from .file_reader import read_many_for_tokens
+from .helpers import calculate_tokens_batch, compile_ignore_matcher
+
+# Only changes to the tree are forwarded; native observers also report opened/closed files
+WATCHED_EVENT_TYPES = frozenset({'created', 'deleted', 'modified', 'moved'})
+
+# Created/deleted paths remembered for drift checks; older entries are dropped
+# and callers asking about that far back fall back to listing folders
+MAX_TRACKED_CHANGES = 10000
+
+
+def _needs_polling(root_path):
+    """Network shares deliver no native change notifications, so they are polled."""
+    normalized = root_path.replace('\\', '/')
+    return normalized.startswith('//') or normalized.startswith('/mnt/')
+
 
 class _EventHandler(FileSystemEventHandler):
-    def __init__(self, event_queue, ignore_rules):
+    def __init__(self, event_queue, ignore_rules, notify=None, root_path=None, on_directory_removed=None):
         super().__init__()
         self.queue = event_queue
         self.ignore_rules = ignore_rules
+        self.notify = notify  # Called after each queued event so the UI thread can schedule a flush
+        # Called when a folder is deleted or moved: its files get no events of their own
+        self.on_directory_removed = on_directory_removed
+        # All rules compiled once: an exact-name set plus a single glob regex
+        self._matches_ignore_rule = compile_ignore_matcher(ignore_rules)
+        # Paths under the root are also matched relative to it, folder by folder
+        self._root_prefix = os.path.join(root_path, '') if root_path else None
 
     def on_any_event(self, event):
-        if event.is_directory or self._is_ignored(event.src_path):
+        if event.event_type not in WATCHED_EVENT_TYPES:
+            return
+        if self._is_ignored(event.src_path):
+            return
+        if event.is_directory:
+            if self.on_directory_removed and event.event_type in ('deleted', 'moved'):
+                self.on_directory_removed()
             return
         
         # Just put the raw event data in the queue
@@ -25,17 +53,24 @@ class _EventHandler(FileSystemEventHandler):
             'dst_path': event.dest_path if isinstance(event, FileSystemMovedEvent) else None
         }
         self.queue.put(event_data)
+        if self.notify:
+            self.notify()
 
     def _is_ignored(self, path):
-        """Check if a path matches any of the glob-style ignore rules."""
-        for pattern in self.ignore_rules:
-            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
-                return True
+        """Check if a path, its path under the root, or any folder/file name in it matches an ignore rule."""
+        if self._matches_ignore_rule(path) or self._matches_ignore_rule(os.path.basename(path)):
+            return True
+        if self._root_prefix and path.startswith(self._root_prefix):
+            # Events from inside an ignored folder (.git, node_modules) are dropped too
+            rel_path = path[len(self._root_prefix):].replace('\\', '/')
+            return self._matches_ignore_rule(rel_path) or any(
+                self._matches_ignore_rule(part) for part in rel_path.split('/'))
         return False
 
 class FileWatcher(QObject):
     fs_event_batch = Signal(list)
     file_token_changed = Signal(str, int)  # file_path, token_diff
+    _events_pending = Signal()  # Emitted from the observer thread, delivered on the Qt thread
 
     def __init__(self, root_path, ignore_rules):
         super().__init__()
@@ -46,20 +81,36 @@ class FileWatcher(QObject):
         self.token_cache = {}
         self._stop_event = threading.Event()
         self._thread = None
+        # Set while a flush is already scheduled, so a burst crosses threads only once
+        self._flush_scheduled = threading.Event()
+        # Files created/deleted while running (forward-slash paths), for drift checks
+        self.started_at = None
+        self._created_at = {}  # path -> time the creation was processed, oldest first
+        self._deleted_at = {}  # path -> time the deletion was processed, oldest first
+        self._history_start = None  # Changes before this time may have been dropped
+        self._directory_removed_at = None  # Set from the observer thread
 
-        # This timer will poll the queue from the main Qt thread
+        # Single-shot timer armed by the first event of a burst; it drains the
+        # queue on the main Qt thread once the interval has passed
         self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(True)
         self.poll_timer.timeout.connect(self._process_queue)
         self.poll_timer.setInterval(150)
+        self._events_pending.connect(self._schedule_flush)
 
     def start(self):
         if self.isRunning():
             return
         self._stop_event.clear()
+        self._flush_scheduled.clear()
+        self.started_at = time.time()
+        self._created_at.clear()
+        self._deleted_at.clear()
+        self._history_start = self.started_at
+        self._directory_removed_at = None
         self._thread = threading.Thread(target=self._run_observer)
         self._thread.daemon = True
         self._thread.start()
-        self.poll_timer.start()
 
     def stop(self):
         if not self.isRunning():
@@ -72,45 +123,182 @@ class FileWatcher(QObject):
     def isRunning(self):
         return self._thread is not None and self._thread.is_alive()
 
+    def file_changes_since(self, timestamp):
+        """Files created and files deleted after timestamp.
+
+        Returns (created_paths, deleted_paths) as sets of forward-slash paths, or
+        None if the watcher's history does not reach back to timestamp.
+        """
+        if (timestamp is None or self._history_start is None or self._history_start > timestamp
+                or not self.isRunning()):
+            return None
+        created = {path for path, created_time in self._created_at.items() if created_time > timestamp}
+        deleted = {path for path, deleted_time in self._deleted_at.items() if deleted_time > timestamp}
+        return created, deleted
+
+    def directory_removed_since(self, timestamp):
+        """True if a folder was deleted or moved after timestamp.
+
+        The files inside such a folder are not in file_changes_since(), so callers
+        have to list the folders themselves.
+        """
+        removed_at = self._directory_removed_at
+        return removed_at is not None and removed_at > timestamp
+
+    def _note_directory_removed(self):
+        """Runs in the observer thread when a folder is deleted or moved."""
+        self._directory_removed_at = time.time()
+
+    def _track_presence(self, event):
+        """Record a processed create/delete/move for file_changes_since()."""
+        action = event['action']
+        now = time.time()
+        if action in ('deleted', 'moved'):
+            gone = os.path.normpath(event['src_path']).replace('\\', '/')
+            self._created_at.pop(gone, None)
+            # Re-inserted so each dict stays ordered by time
+            self._deleted_at.pop(gone, None)
+            self._deleted_at[gone] = now
+        added = event['src_path'] if action == 'created' else event.get('dst_path') if action == 'moved' else None
+        if added:
+            added = os.path.normpath(added).replace('\\', '/')
+            self._deleted_at.pop(added, None)
+            self._created_at.pop(added, None)
+            self._created_at[added] = now
+        self._trim_history(self._created_at)
+        self._trim_history(self._deleted_at)
+
+    def _trim_history(self, changes):
+        """Drop the oldest entries beyond MAX_TRACKED_CHANGES and move the history start past them."""
+        while len(changes) > MAX_TRACKED_CHANGES:
+            oldest = next(iter(changes))
+            self._history_start = max(self._history_start or 0, changes.pop(oldest))
+
     def _run_observer(self):
         """This method runs in the background thread."""
-        event_handler = _EventHandler(self.event_queue, self.ignore_rules)
-        observer = Observer()
-        observer.schedule(event_handler, self.root_path, recursive=True)
-        observer.start()
-        while not self._stop_event.is_set():
-            time.sleep(0.1)
+        event_handler = _EventHandler(self.event_queue, self.ignore_rules, self._notify_event, self.root_path,
+                                      self._note_directory_removed)
+        # Native notifications (inotify, FSEvents, ReadDirectoryChangesW with subtree
+        # watching) cost nothing while idle; polling re-lists the whole tree every second
+        observer = PollingObserver() if _needs_polling(self.root_path) else Observer()
+        try:
+            observer.schedule(event_handler, self.root_path, recursive=True)
+            observer.start()
+        except OSError as e:
+            # e.g. the inotify watch limit was reached on a very large tree
+            print(f"[WATCHER] ⚠️ Native file watching unavailable ({e}), falling back to polling")
+            observer = PollingObserver()
+            observer.schedule(event_handler, self.root_path, recursive=True)
+            observer.start()
+        # Block until stop() instead of waking up to poll the flag
+        self._stop_event.wait()
         observer.stop()
         observer.join()
 
+    def _notify_event(self):
+        """Runs in the observer thread after an event was queued."""
+        if not self._flush_scheduled.is_set():
+            self._flush_scheduled.set()
+            self._events_pending.emit()
+
+    def _schedule_flush(self):
+        """Arm the flush timer; later events of the same burst join that flush."""
+        if self.isRunning() and not self.poll_timer.isActive():
+            self.poll_timer.start()
+
     def _process_queue(self):
         """This method runs in the main Qt thread."""
+        # Cleared before draining: an event queued from now on schedules a new flush
+        self._flush_scheduled.clear()
         if self.event_queue.empty():
             return
 
-        fs_events = []
+        raw_events = []
         while not self.event_queue.empty():
             try:
-                event = self.event_queue.get_nowait()
-                if event['action'] == 'modified':
-                    # Handle token changes here in the main thread
-                    path = event['src_path']
-                    old_tokens = self.token_cache.get(path, count_tokens_in_file(path))
-                    new_tokens = count_tokens_in_file(path)
-                    token_diff = new_tokens - old_tokens
-                    self.token_cache[path] = new_tokens
-                    if token_diff != 0:
-                        self.file_token_changed.emit(path, token_diff)
-                else:
-                    fs_events.append(event)
-                    # Update token cache for moves/deletes
-                    if event['action'] == 'deleted' and event['src_path'] in self.token_cache:
-                        del self.token_cache[event['src_path']]
-                    elif event['action'] == 'moved' and event['src_path'] in self.token_cache:
-                        self.token_cache[event['dst_path']] = self.token_cache.pop(event['src_path'])
-
+                raw_events.append(self.event_queue.get_nowait())
             except queue.Empty:
                 break
+
+        fs_events = []
+        modified_paths = []
+        for event in self._coalesce(raw_events):
+            if event['action'] == 'modified':
+                modified_paths.append(event['src_path'])
+            else:
+                fs_events.append(event)
+                self._track_presence(event)
+                # Update token cache for moves/deletes
+                if event['action'] == 'deleted' and event['src_path'] in self.token_cache:
+                    del self.token_cache[event['src_path']]
+                elif event['action'] == 'moved' and event['src_path'] in self.token_cache:
+                    self.token_cache[event['dst_path']] = self.token_cache.pop(event['src_path'])
+
+        # Handle token changes here in the main thread, reading and encoding
+        # all modified files of the batch together
+        for path, new_tokens in zip(modified_paths, self._count_tokens(modified_paths)):
+            # A file seen for the first time has no previous count to diff against
+            old_tokens = self.token_cache.get(path, new_tokens)
+            token_diff = new_tokens - old_tokens
+            self.token_cache[path] = new_tokens
+            if token_diff != 0:
+                self.file_token_changed.emit(path, token_diff)
         
         if fs_events:
             self.fs_event_batch.emit(fs_events)
+
+    @staticmethod
+    def _count_tokens(paths):
+        """Token counts for several files: concurrent reads, one batched encode."""
+        counts = [0] * len(paths)
+        texts = []
+        text_indices = []
+        for i, (text, estimated_tokens) in enumerate(read_many_for_tokens(paths)):
+            if text is None:
+                counts[i] = estimated_tokens
+            else:
+                text_indices.append(i)
+                texts.append(text)
+        for i, tokens in zip(text_indices, calculate_tokens_batch(texts)):
+            counts[i] = tokens
+        return counts
+
+    @staticmethod
+    def _coalesce(events):
+        """Collapse a burst of raw events into at most one pending event per path.
+
+        created+deleted cancel out, deleted+created becomes modified, repeated
+        modifications collapse, and a later delete replaces earlier modifications.
+        Moves are kept as-is and close any pending entry for both of their paths,
+        so event order relative to a move is preserved.
+        """
+        merged = []
+        pending = {}  # path -> index into merged
+        for event in events:
+            action = event['action']
+            path = event['src_path']
+
+            if action == 'moved':
+                pending.pop(path, None)
+                pending.pop(event.get('dst_path'), None)
+                merged.append(event)
+                continue
+
+            index = pending.get(path)
+            if index is None:
+                pending[path] = len(merged)
+                merged.append(event)
+                continue
+
+            previous = merged[index]['action']
+            if previous == 'created' and action == 'deleted':
+                merged[index] = None
+                del pending[path]
+            elif previous == 'deleted' and action == 'created':
+                merged[index] = dict(event, action='modified')
+            elif previous != 'created':
+                # Latest action wins (modified+modified, modified+deleted)
+                merged[index] = event
+            # created followed by modified stays a single create
+
+        return [event for event in merged if event is not None]
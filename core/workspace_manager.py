@@ -20,6 +20,12 @@ BACKUP_RETENTION_DAYS = 7
 # Global variable to hold the base path for testing
 _TESTING_BASE_PATH = None
 
+# Last verified workspace file: ((path, st_mtime_ns, st_size), json_text)
+_workspace_cache = None
+
+# Backup directory -> [(mtime, path)] newest first, kept in step by _manage_backups
+_backup_cache = {}
+
 # This was in scan_config_dialog.py, moved here to avoid core -> dialogs dependency
 DEFAULT_IGNORE_FOLDERS = [
     ".git", "__pycache__", ".vscode", ".idea", "node_modules", "venv", ".venv",
@@ -108,17 +114,46 @@ def _validate_and_correct_path(folder_path):
 
     return folder_path
 
+def _checksum_suffix(checksum):
+    """The closing text json.dumps(indent=4) produces when 'checksum' is the last key."""
+    return f',\n    "checksum": "{checksum}"\n}}'
+
+def _dumps_with_checksum(data):
+    """Serializes data once with indent=4 and appends its checksum as the last key.
+
+    Returns UTF-8 bytes identical to json.dumps({**data, 'checksum': ...}, indent=4).
+    Sets are written as lists.
+    """
+    # Encoded once: the same bytes are hashed and written
+    json_bytes = json.dumps(data, indent=4, default=sorted).encode('utf-8')
+    checksum = hashlib.sha256(json_bytes).hexdigest()
+    if not data:
+        return json.dumps({"checksum": checksum}, indent=4).encode('utf-8')
+    # Drop the closing "\n}" and continue the object with the checksum entry
+    return b"".join((memoryview(json_bytes)[:-2], _checksum_suffix(checksum).encode('ascii')))
+
 def _load_and_verify(filepath):
     """Loads a JSON file, verifies its checksum, and returns the data."""
     with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        json_text = f.read()
+    return _parse_and_verify(json_text)
+
+def _parse_and_verify(json_text):
+    """Parses workspace JSON text, verifies its checksum, and returns the data."""
+    data = json.loads(json_text)
 
     checksum = data.pop("checksum", None)
     if not checksum:
         raise ValueError("Missing checksum.")
 
     # The checksum is calculated on the byte-string of the JSON dump, without the checksum field.
-    # We must be careful to dump it with the same settings (indent=4) to get the same string.
+    # A file we wrote ends with the checksum entry, so cutting it off gives that string back
+    # without re-serializing; anything else is re-dumped with the same settings (indent=4).
+    suffix = _checksum_suffix(checksum)
+    if json_text.endswith(suffix):
+        json_bytes = (json_text[:-len(suffix)] + "\n}").encode('utf-8')
+        if hashlib.sha256(json_bytes).hexdigest() == checksum:
+            return data
     json_bytes = json.dumps(data, indent=4).encode('utf-8')
     calculated_checksum = hashlib.sha256(json_bytes).hexdigest()
 
@@ -148,14 +183,52 @@ def _get_workspace_file_path(base_path=None):
         return Path(base_path).resolve() / WORKSPACE_FILE
     return Path.cwd() / WORKSPACE_FILE
 
+def _workspace_cache_key(workspace_file_path):
+    """Identify the current version of the workspace file by path, mtime and size."""
+    st = os.stat(workspace_file_path)
+    return (str(workspace_file_path), st.st_mtime_ns, st.st_size)
+
+def _get_cached_workspaces(workspace_file_path):
+    """Return fresh workspace data from the cached text if the file is unchanged, else None.
+
+    The verified text is kept instead of the parsed dicts: json.loads builds an
+    independent copy several times faster than copy.deepcopy would.
+    """
+    if _workspace_cache is None:
+        return None
+    cache_key, json_text = _workspace_cache
+    if cache_key != _workspace_cache_key(workspace_file_path):
+        return None
+    data = json.loads(json_text)
+    data.pop("checksum", None)
+    return data
+
+def _cache_workspaces(cache_key, json_text):
+    """Remember verified workspace text under the file's (path, mtime, size) key."""
+    global _workspace_cache
+    _workspace_cache = (cache_key, json_text)
+
+def _invalidate_workspace_cache():
+    """Forget the cached workspace data so the next load re-parses the file."""
+    global _workspace_cache
+    _workspace_cache = None
+
 def load_workspaces(base_path=None):
     """Loads workspaces from the JSON file, with integrity checks and backup fallback."""
     workspace_file_path = _get_workspace_file_path(base_path)
     # Attempt to load the primary file
     try:
         if workspace_file_path.exists():
+            cached_data = _get_cached_workspaces(workspace_file_path)
+            if cached_data is not None:
+                return _migrate_workspaces(cached_data)
             print(f"Loading workspaces from {workspace_file_path}")
-            loaded_data = _load_and_verify(workspace_file_path)
+            # Key taken before reading: a write in between just causes a re-parse next time
+            cache_key = _workspace_cache_key(workspace_file_path)
+            json_text = workspace_file_path.read_text(encoding='utf-8')
+            loaded_data = _parse_and_verify(json_text)
+            _cache_workspaces(cache_key, json_text)
+            # The caller owns this dict; later loads parse their own copy from the cached text
             return _migrate_workspaces(loaded_data)
         else:
              raise FileNotFoundError
@@ -170,12 +243,20 @@ def load_workspaces(base_path=None):
         print(f"Could not load primary workspace file '{workspace_file_path}': {e}")
         # Attempt to restore from the backups directory
         backup_dir = workspace_file_path.parent / BACKUP_DIR
+        # Something changed behind our back; rescan backups on the next save
+        _backup_cache.pop(str(backup_dir), None)
         if backup_dir.exists():
             backups = sorted(backup_dir.glob("workspaces_*.bak"), key=os.path.getmtime, reverse=True)
             for backup_file in backups:
                 try:
                     print(f"Attempting to restore from backup: {backup_file}")
-                    shutil.copy(backup_file, workspace_file_path)
+                    # Through a temp file: copying in place would also rewrite the backup
+                    # that shares workspaces.json's inode (see _manage_backups)
+                    restore_path = workspace_file_path.with_suffix('.json.tmp')
+                    # A temp file left by an interrupted save may already be linked as a backup
+                    restore_path.unlink(missing_ok=True)
+                    shutil.copy(backup_file, restore_path)
+                    os.replace(restore_path, workspace_file_path)
                     loaded_data = _load_and_verify(workspace_file_path)
                     print(f"Successfully restored from backup: {backup_file}")
                     # Save the restored data to regenerate checksum and ensure consistency
@@ -229,8 +310,28 @@ def load_workspaces(base_path=None):
     print(f"Workspaces loaded and validated from {WORKSPACE_FILE}")
     return workspaces
 
+def _list_backups(backup_dir):
+    """Backups in backup_dir as [(mtime, path)], newest first, scanning the directory only once."""
+    key = str(backup_dir)
+    backups = _backup_cache.get(key)
+    if backups is None:
+        backups = sorted(((p.stat().st_mtime, p) for p in backup_dir.glob("workspaces_*.bak")), reverse=True)
+        _backup_cache[key] = backups
+    return backups
+
 def _manage_backups(source_path, base_path=None):
-    """Creates a timestamped backup and prunes old backups based on retention policies."""
+    """Creates a timestamped backup and prunes old backups based on retention policies.
+
+    Called with the fsynced temp file just before it replaces the workspace file:
+    the backup is a hard link to it, so no bytes are written twice.
+
+    Invariant: after the replace the newest backup and workspaces.json share an
+    inode, so workspaces.json must never be truncated and rewritten in place, or
+    that backup changes with it. Every write in this module goes to a temp file
+    that os.replace then moves over workspaces.json. A new writer must do the
+    same. Edits made in place outside the app (e.g. an editor) still reach the
+    newest backup; older backups are unaffected.
+    """
     workspace_file_path = _get_workspace_file_path(base_path)
     backup_dir = workspace_file_path.parent / BACKUP_DIR
     backup_dir.mkdir(exist_ok=True)
@@ -238,25 +339,70 @@ def _manage_backups(source_path, base_path=None):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_filename = f"workspaces_{timestamp}.bak"
     dest_backup_path = backup_dir / backup_filename
-    shutil.copy(source_path, dest_backup_path)
-
+    backups = _list_backups(backup_dir)
+    dest_backup_path.unlink(missing_ok=True)
     try:
-        all_backups = sorted(backup_dir.glob("workspaces_*.bak"), key=os.path.getmtime, reverse=True)
-        
-        if len(all_backups) > MAX_BACKUPS:
-            for old_backup in all_backups[MAX_BACKUPS:]:
-                old_backup.unlink()
+        # Shares source_path's inode: every later write to workspaces.json has to
+        # go through a temp file plus os.replace, never an in-place rewrite
+        os.link(source_path, dest_backup_path)
+    except OSError:
+        # No hard links on this filesystem
+        shutil.copy2(source_path, dest_backup_path)
 
-        retention_limit = datetime.now() - timedelta(days=BACKUP_RETENTION_DAYS)
-        remaining_backups = sorted(backup_dir.glob("workspaces_*.bak"), key=os.path.getmtime)
-        for backup in remaining_backups:
-            backup_time = datetime.fromtimestamp(backup.stat().st_mtime)
-            if backup_time < retention_limit:
-                backup.unlink()
+    # Two saves within the same second overwrite the same backup file
+    backups[:] = [entry for entry in backups if entry[1] != dest_backup_path]
+    backups.insert(0, (time.time(), dest_backup_path))
+
+    try:
+        # Prune by count, then by age, from the cached list - only removed files are touched
+        retention_limit = (datetime.now() - timedelta(days=BACKUP_RETENTION_DAYS)).timestamp()
+        removed = backups[MAX_BACKUPS:]
+        kept = []
+        for entry in backups[:MAX_BACKUPS]:
+            (kept if entry[0] >= retention_limit else removed).append(entry)
+        backups[:] = kept
+        for _, old_backup in removed:
+            old_backup.unlink(missing_ok=True)
 
     except OSError as e:
+        # Resynchronize with the directory on the next save
+        _backup_cache.pop(str(backup_dir), None)
         print(f"Error pruning backups: {e}")
 
+def _comparable(data):
+    """Copy of workspace data with checked_paths and ignore_folders as frozensets.
+
+    Selection order is irrelevant, so saved and in-memory data are compared
+    as sets instead of sorting the paths on every save.
+    """
+    if not isinstance(data, dict):
+        return data
+    comparable = dict(data)
+    workspaces = comparable.get("workspaces")
+    if isinstance(workspaces, dict):
+        comparable["workspaces"] = {name: _comparable_workspace(ws) for name, ws in workspaces.items()}
+    return comparable
+
+def _comparable_workspace(ws_data):
+    """Single-workspace part of _comparable()."""
+    if not isinstance(ws_data, dict):
+        return ws_data
+    ws_data = dict(ws_data)
+    if isinstance(ws_data.get("checked_paths"), (list, set, frozenset)):
+        ws_data["checked_paths"] = frozenset(ws_data["checked_paths"])
+    scan_settings = ws_data.get("scan_settings")
+    if isinstance(scan_settings, dict) and isinstance(scan_settings.get("ignore_folders"), (list, set, frozenset)):
+        ws_data["scan_settings"] = dict(scan_settings, ignore_folders=frozenset(scan_settings["ignore_folders"]))
+    groups = ws_data.get("selection_groups")
+    if isinstance(groups, dict):
+        ws_data["selection_groups"] = {
+            name: (dict(group, checked_paths=frozenset(group["checked_paths"]))
+                   if isinstance(group, dict) and isinstance(group.get("checked_paths"), (list, set, frozenset))
+                   else group)
+            for name, group in groups.items()
+        }
+    return ws_data
+
 def save_workspaces(workspaces, base_path=None):
     """Saves the workspaces dictionary, creating a backup only if data has changed.
 
@@ -285,10 +431,9 @@ def save_workspaces(workspaces, base_path=None):
         raw_scan_settings = ws_data.get("scan_settings")
         complete_scan_settings = ensure_complete_scan_settings(raw_scan_settings)
         
-        # Convert sets to lists for JSON serialization
+        # ignore_folders stays a set: like checked_paths it is compared as a set
+        # and written as a sorted list by json.dumps(default=sorted)
         scan_settings = complete_scan_settings.copy()
-        if isinstance(scan_settings.get("ignore_folders"), set):
-            scan_settings["ignore_folders"] = sorted(list(scan_settings["ignore_folders"]))
         
         validated_data = {
             "folder_path": ws_data.get("folder_path"),
@@ -298,12 +443,9 @@ def save_workspaces(workspaces, base_path=None):
             "selection_groups": ws_data.get("selection_groups", {})
         }
         
-        # Ensure selection groups have proper structure
-        for group_name, group_data in validated_data.get("selection_groups", {}).items():
-            if isinstance(group_data, dict) and "checked_paths" in group_data:
-                if isinstance(group_data["checked_paths"], set):
-                    group_data["checked_paths"] = sorted(list(group_data["checked_paths"]))
-        
+        # checked_paths sets are kept as-is: they are compared as sets below and only
+        # sorted by json.dumps(default=sorted) when a save actually writes them;
+        # set iteration order changes between runs, so the file would otherwise too
         clean_workspaces[ws_name] = validated_data
 
     data_to_save = {
@@ -315,36 +457,43 @@ def save_workspaces(workspaces, base_path=None):
     # Check if data has actually changed before saving
     try:
         existing_data = load_workspaces(base_path=base_path)
-        # Normalize existing data for comparison
-        if existing_data.get('workspaces'):
-            for ws in existing_data['workspaces'].values():
-                if 'checked_paths' in ws:
-                    ws['checked_paths'] = sorted(list(set(ws.get('checked_paths', []))))
     except Exception:
         existing_data = None
 
-    if data_to_save == existing_data:
+    if existing_data is not None and _comparable(data_to_save) == _comparable(existing_data):
         return False
 
-    # Add checksum
-    json_bytes = json.dumps(data_to_save, indent=4).encode('utf-8')
-    checksum = hashlib.sha256(json_bytes).hexdigest()
-    final_data = data_to_save.copy()
-    final_data['checksum'] = checksum
-
     # Atomic write
     temp_file_path = workspace_file_path.with_suffix('.json.tmp')
     try:
         json_start = time.time()
-        with open(temp_file_path, 'w', encoding='utf-8') as f:
-            json.dump(final_data, f, indent=4)
+        # Serialize once; the checksum entry is appended to the same text
+        payload = _dumps_with_checksum(data_to_save)
         json_time = (time.time() - json_start) * 1000
         print(f"[SAVE] 📝 JSON dump took {json_time:.2f}ms")
+
+        # A temp file left by an interrupted save may already be a backup's hard link;
+        # unlinking it first keeps O_TRUNC from rewriting that backup
+        temp_file_path.unlink(missing_ok=True)
+        # One write plus fsync, so the rename below can never expose a partial file
+        fd = os.open(temp_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
         
-        # Create backup from the temp file before moving
+        # Back up the new file before moving it into place
         _manage_backups(temp_file_path, base_path=base_path)
         
-        shutil.move(temp_file_path, workspace_file_path)
+        # os.replace swaps the file in one step, so the watcher never sees it truncated.
+        # It is also the only way workspaces.json may be written: the newest backup
+        # is a hard link to the same inode, so an in-place write would change it too
+        os.replace(temp_file_path, workspace_file_path)
+        # mtime granularity can hide a rewrite, so never trust the old entry
+        _invalidate_workspace_cache()
         
         total_time = (time.time() - start_time) * 1000
         print(f"[SAVE] ✅ Workspaces saved successfully in {total_time:.2f}ms")
@@ -396,8 +545,10 @@ def load_custom_instructions(base_path=None):
 def save_custom_instructions(instructions, base_path=None):
     """Saves custom instruction templates to JSON file."""
     instructions_file = _get_instructions_file_path(base_path)
+    temp_file_path = instructions_file.with_suffix('.json.tmp')
     try:
-        with open(instructions_file, 'w', encoding='utf-8') as f:
+        with open(temp_file_path, 'w', encoding='utf-8') as f:
             json.dump(instructions, f, indent=4)
+        os.replace(temp_file_path, instructions_file)
     except (IOError, TypeError) as e:
         print(f"Error saving custom instructions: {e}")
@@ -1,5 +1,6 @@
 # --- File: main.py (Bootstrap) ---
 import sys
+import logging
 import multiprocessing as mp
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
@@ -10,6 +11,8 @@ from ui.main_window import MainWindow
 def main():
     """Application entry point."""
     print("[MAIN] 🚀 Starting application...")
+    # Controller trace output is debug-level; raise to DEBUG to see it
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
     app = QApplication(sys.argv)
     print("[MAIN] ✅ QApplication created")
     
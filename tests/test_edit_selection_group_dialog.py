@@ -29,8 +29,8 @@ def test_dialog_initial_state(dialog):
     """Test the initial state of the dialog and its widgets."""
     assert dialog.name_edit.text() == "My Group"
     assert dialog.description_edit.toPlainText() == "A test group"
-    assert dialog.path_list.count() == 1
-    assert dialog.path_list.item(0).text() == "file1.py"
+    assert dialog.path_model.rowCount() == 1
+    assert dialog.path_model.stringList()[0] == "file1.py"
     ok_button = dialog.button_box.button(QDialogButtonBox.Ok)
     assert ok_button.isEnabled() is True
 
@@ -74,7 +74,7 @@ def test_get_result(dialog):
     """Test that get_result returns the correct, updated data."""
     dialog.name_edit.setText("Updated Name")
     dialog.description_edit.setPlainText("Updated description.")
-    dialog.path_list.addItem("file2.txt")
+    dialog.path_model.setStringList(dialog.path_model.stringList() + ["file2.txt"])
 
     result = dialog.get_result()
     assert result["name"] == "Updated Name"
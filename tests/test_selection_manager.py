@@ -113,6 +113,20 @@ class TestSelectionManager(unittest.TestCase):
         self.assertIn("My Group", groups)
         self.assertEqual(groups["My Group"]["checked_paths"], ["a.py"])
 
+    def test_to_absolute_paths_matches_join_normpath(self):
+        """Test that the prefix fast path gives the same result as join + normpath."""
+        import os
+        root = "/repo/project/"
+        stored = ["main.py", "src/app.py", ".github/ci.yml", "src/../README.md", "./docs/a.md", "/abs/file.py"]
+
+        expected = [os.path.normpath(os.path.join(root, p)).replace('\\', '/') for p in stored]
+        self.assertEqual(selection_manager.to_absolute_paths(stored, root), expected)
+
+    def test_to_absolute_paths_without_root(self):
+        """Test that paths are only normalized when there is no workspace root."""
+        paths = selection_manager.to_absolute_paths(["a/./b.py", "c//d.py"], None)
+        self.assertEqual(paths, ["a/b.py", "c/d.py"])
+
     def test_save_new_group(self):
         """U-06: Test saving a new group and ensure groups are sorted alphabetically."""
         workspace = {}
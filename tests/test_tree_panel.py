@@ -3,7 +3,7 @@ from unittest.mock import patch, Mock
 import os
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QCoreApplication
 
 # Adjust the import path based on your project structure
 from ui.widgets.tree_panel import TreePanel
@@ -18,11 +18,17 @@ class TestTreePanel(unittest.TestCase):
     def setUp(self):
         """Set up the TreePanel instance before each test."""
         self.panel = TreePanel()
+        # Skip per-row font metrics work while rows are added
+        self.panel.tree_widget.setUniformRowHeights(True)
 
     def tearDown(self):
         """Clean up resources after each test."""
         self.panel.deleteLater()
 
+    def _flush(self):
+        """Deliver pending events without a full processEvents() repaint pass."""
+        QCoreApplication.sendPostedEvents(None, 0)
+
     def test_folder_token_calculation_and_display(self):
         """Test that folder token counts are calculated and displayed correctly."""
         # 1. Define a mock file structure and populate the tree
@@ -57,7 +63,7 @@ class TestTreePanel(unittest.TestCase):
 
         # 4. Programmatically check an item and verify the display updates
         file2_item.setCheckState(0, Qt.CheckState.Checked)
-        self.app.processEvents() # Allow signals to be processed
+        self._flush() # Allow signals to be processed
 
         # Subdir should now show 250 selected tokens
         # Project root should also show 250 selected tokens
@@ -66,7 +72,7 @@ class TestTreePanel(unittest.TestCase):
 
         # 5. Check another item and verify the display updates again
         file1_item.setCheckState(0, Qt.CheckState.Checked)
-        self.app.processEvents()
+        self._flush()
 
         # Subdir is unchanged
         # Project root should now show 250 + 100 = 350 selected tokens
@@ -94,7 +100,7 @@ class TestTreePanel(unittest.TestCase):
 
         # 3. Test child-to-parent propagation: checking a deep child checks all parents
         file3_item.setCheckState(0, Qt.CheckState.Checked)
-        self.app.processEvents()
+        self._flush()
 
         self.assertEqual(file3_item.checkState(0), Qt.CheckState.Checked)
         self.assertEqual(nested_dir_item.checkState(0), Qt.CheckState.Checked)
@@ -103,7 +109,7 @@ class TestTreePanel(unittest.TestCase):
 
         # 4. Test parent-to-child propagation: unchecking a parent unchecks all children
         root_item.setCheckState(0, Qt.CheckState.Unchecked)
-        self.app.processEvents()
+        self._flush()
 
         self.assertEqual(root_item.checkState(0), Qt.CheckState.Unchecked)
         self.assertEqual(subdir_item.checkState(0), Qt.CheckState.Unchecked)
@@ -112,7 +118,7 @@ class TestTreePanel(unittest.TestCase):
 
         # 5. Test parent-to-child propagation: checking a parent checks all children
         subdir_item.setCheckState(0, Qt.CheckState.Checked)
-        self.app.processEvents()
+        self._flush()
 
         self.assertEqual(subdir_item.checkState(0), Qt.CheckState.Checked)
         self.assertEqual(nested_dir_item.checkState(0), Qt.CheckState.Checked)
@@ -142,7 +148,7 @@ class TestTreePanel(unittest.TestCase):
         
         file1_item.setCheckState(0, Qt.CheckState.Checked)
         main_py_item.setCheckState(0, Qt.CheckState.Checked)
-        self.app.processEvents() # Allow checkbox propagation logic to run
+        self._flush() # Allow checkbox propagation logic to run
 
         # 3. Test get_checked_paths with relative=False (default)
         abs_paths = self.panel.get_checked_paths(return_set=True)
@@ -0,0 +1,92 @@
+import pytest
+import os
+
+# Adjust path to import from 'ui'
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from PySide6.QtCore import Qt
+from ui.models.file_tree_model import FileTreeModel
+
+@pytest.fixture
+def large_folder_model():
+    """A model whose only folder has more files than the first fetch batch."""
+    model = FileTreeModel()
+    file_count = FileTreeModel.FETCH_BATCH_SIZE + 100
+    items = [('/repo/big', True, 'big', 0, 0)]
+    items += [(f'/repo/big/f{i:04d}.py', False, f'big/f{i:04d}.py', 10, 5) for i in range(file_count)]
+    model.populate_from_bg_scanner(items, '/repo')
+    return model
+
+def test_changes_to_unfetched_rows_only_notify_exposed_rows(large_folder_model):
+    """Checks and token updates past the fetched rows emit dataChanged only for rows views know."""
+    model = large_folder_model
+    emitted = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=None: emitted.append((top_left, bottom_right)))
+
+    node = model.get_node_by_path(f'/repo/big/f{FileTreeModel.FETCH_BATCH_SIZE + 50:04d}.py')
+    assert node.row() >= model._visible_child_count(node.parent)
+
+    model.setData(model.index_for_node(node), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    model.set_file_token_count(node, 42)
+
+    assert node.check_state == Qt.CheckState.Checked
+    assert node.parent.selected_tokens == 42
+    assert emitted
+    for top_left, bottom_right in emitted:
+        rows = model._visible_child_count(top_left.internalPointer().parent)
+        assert top_left.row() < rows and bottom_right.row() < rows
+
+@pytest.fixture
+def nested_folder_model():
+    """A model with a folder holding one file and one subfolder."""
+    model = FileTreeModel()
+    items = [
+        ('/repo/src', True, 'src', 0, 0),
+        ('/repo/src/a.py', False, 'src/a.py', 10, 5),
+        ('/repo/src/pkg', True, 'src/pkg', 0, 0),
+        ('/repo/src/pkg/b.py', False, 'src/pkg/b.py', 10, 5),
+    ]
+    model.populate_from_bg_scanner(items, '/repo')
+    model.set_file_token_count(model.get_node_by_path('/repo/src/a.py'), 3)
+    model.set_file_token_count(model.get_node_by_path('/repo/src/pkg/b.py'), 7)
+    return model
+
+def test_toggling_folder_refreshes_its_token_column(nested_folder_model):
+    """Checking a folder emits dataChanged for its own column-1 token label."""
+    model = nested_folder_model
+    emitted = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=None: emitted.append((top_left, bottom_right, roles)))
+
+    folder = model.get_node_by_path('/repo/src')
+    model.setData(model.index_for_node(folder), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+
+    assert folder.selected_tokens == 10
+    assert any(
+        top_left.internalPointer() is folder and top_left.column() == 1
+        and Qt.ItemDataRole.DisplayRole in (roles or [])
+        for top_left, bottom_right, roles in emitted
+    )
+
+def test_deleting_child_recomputes_parent_check_state(nested_folder_model):
+    """A folder left with only checked children becomes checked when the unchecked one is deleted."""
+    model = nested_folder_model
+    folder = model.get_node_by_path('/repo/src')
+    model.setData(model.index_for_node(model.get_node_by_path('/repo/src/pkg')),
+                  Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    assert folder.check_state == Qt.CheckState.PartiallyChecked
+
+    model.handle_fs_events([{'action': 'deleted', 'src_path': '/repo/src/a.py'}])
+
+    assert folder.check_state == Qt.CheckState.Checked
+
+def test_filesystem_root_workspace_keeps_files_under_project_node():
+    """With '/' as the workspace root, top-level files hang off the project node."""
+    model = FileTreeModel()
+    model.populate_from_bg_scanner([('/top.py', False, 'top.py', 10, 5)], '/')
+    model.handle_fs_events([{'action': 'created', 'src_path': '/new.py'}])
+
+    project = model.get_node_by_path('/')
+    assert model.get_node_by_path('/top.py').parent is project
+    assert model.get_node_by_path('/new.py').parent is project
+    assert '' not in model.path_to_node
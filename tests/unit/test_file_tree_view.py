@@ -0,0 +1,36 @@
+import pytest
+import os
+
+# Adjust path to import from 'ui'
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from PySide6.QtCore import Qt
+from ui.widgets.file_tree_view import FileTreeView
+
+@pytest.fixture
+def file_tree_view(qtbot):
+    view = FileTreeView()
+    qtbot.addWidget(view)
+    return view
+
+def test_set_checked_paths_unchecks_empty_folders_from_previous_group(file_tree_view):
+    """An empty folder checked through its parent is unchecked when switching to a group without it."""
+    model = file_tree_view.model
+    model.populate_from_bg_scanner([
+        ('/repo/src', True, 'src', 0, 0),
+        ('/repo/src/empty', True, 'src/empty', 0, 0),
+        ('/repo/src/a.py', False, 'src/a.py', 10, 3),
+        ('/repo/b.py', False, 'b.py', 10, 2),
+    ], '/repo')
+    src = model.get_node_by_path('/repo/src')
+    empty = model.get_node_by_path('/repo/src/empty')
+    model.setData(model.index_for_node(src), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    assert empty.check_state == Qt.CheckState.Checked
+
+    file_tree_view.set_checked_paths({'/repo/b.py'})
+
+    assert empty.check_state == Qt.CheckState.Unchecked
+    assert src.check_state == Qt.CheckState.Unchecked
+    assert src.checked_children == 0
+    assert model.get_node_by_path('/repo').check_state == Qt.CheckState.PartiallyChecked
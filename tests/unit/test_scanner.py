@@ -101,3 +101,20 @@ def test_streamlined_scanner_error_on_bad_path(tmp_path):
     else:
         # Scanner failed to start, which is also acceptable
         assert True
+
+def test_streamlined_scanner_recovers_when_results_are_lost():
+    """A scan that ends without results reports an error instead of polling forever."""
+    scanner = StreamlinedScanner()
+    errors = []
+    scanner.scan_error.connect(errors.append)
+    scanner.scan_start_time = time.time()
+    scanner.scan_id = 2
+    scanner.scan_running = True
+
+    # End-of-scan marker left over from the previous scan on the reused worker
+    scanner._process_result({'type': 'worker_idle', 'scan_id': 1})
+    assert scanner.scan_running and not errors
+
+    scanner._process_result({'type': 'worker_idle', 'scan_id': 2})
+    assert not scanner.scan_running
+    assert errors == ["Scan finished without results"]
@@ -251,3 +251,23 @@ def test_token_label_update(tree_panel, qtbot, tmp_path):
 
 
 
+
+def test_fs_event_token_changes_are_reported_once_per_batch(tree_panel, tmp_path):
+    """Deleted files' tokens arrive in one batch signal; the per-file signal stays quiet once it is connected."""
+    items = [
+        (str(tmp_path / "a.py"), False, True, '', 50),
+        (str(tmp_path / "b.py"), False, True, '', 80),
+    ]
+    tree_panel.populate_tree(items, str(tmp_path))
+    batches, per_file = [], []
+    tree_panel.file_tokens_changed_batch.connect(batches.append)
+    tree_panel.file_tokens_changed.connect(lambda path, delta: per_file.append((path, delta)))
+
+    tree_panel.update_from_fs_events([
+        {'action': 'deleted', 'src_path': str(tmp_path / "a.py")},
+        {'action': 'deleted', 'src_path': str(tmp_path / "b.py")},
+    ])
+
+    root = str(tmp_path).replace('\\', '/')
+    assert batches == [{f"{root}/a.py": -50, f"{root}/b.py": -80}]
+    assert per_file == []
@@ -83,3 +83,112 @@ def test_watcher_emits_batch_with_polling_interval(temp_watched_dir, qtbot):
     assert blocker.signal_triggered
     
     watcher.stop()
+
+def test_watcher_coalesces_event_bursts():
+    """Ensure bursts are reduced to one pending event per path before emitting."""
+    events = [
+        {'action': 'created', 'src_path': 'tmp.txt', 'dst_path': None},
+        {'action': 'modified', 'src_path': 'a.py', 'dst_path': None},
+        {'action': 'modified', 'src_path': 'a.py', 'dst_path': None},
+        {'action': 'deleted', 'src_path': 'tmp.txt', 'dst_path': None},
+        {'action': 'deleted', 'src_path': 'b.py', 'dst_path': None},
+        {'action': 'created', 'src_path': 'b.py', 'dst_path': None},
+        {'action': 'modified', 'src_path': 'c.py', 'dst_path': None},
+        {'action': 'deleted', 'src_path': 'c.py', 'dst_path': None},
+    ]
+
+    merged = FileWatcher._coalesce(events)
+
+    assert [(e['action'], e['src_path']) for e in merged] == [
+        ('modified', 'a.py'),
+        ('modified', 'b.py'),
+        ('deleted', 'c.py'),
+    ]
+
+def test_watcher_keeps_single_create_for_write_burst():
+    """A created file that is written to several times is reported once, as created."""
+    events = [
+        {'action': 'created', 'src_path': 'new.py', 'dst_path': None},
+        {'action': 'modified', 'src_path': 'new.py', 'dst_path': None},
+        {'action': 'modified', 'src_path': 'new.py', 'dst_path': None},
+    ]
+
+    merged = FileWatcher._coalesce(events)
+
+    assert merged == [events[0]]
+
+def test_event_handler_matches_precompiled_ignore_rules():
+    """Ignore rules are compiled once and matched against the full path or the file name."""
+    from core.watcher import _EventHandler
+    handler = _EventHandler(MagicMock(), ['*.log', '__pycache__', '/repo/build/*'])
+
+    assert handler._is_ignored('/repo/app.log')
+    assert handler._is_ignored('/repo/__pycache__')
+    assert handler._is_ignored('/repo/build/output.bin')
+    assert not handler._is_ignored('/repo/src/main.py')
+
+def test_event_handler_ignores_events_inside_ignored_folders():
+    """Files below an ignored folder are filtered by their path relative to the watched root."""
+    from core.watcher import _EventHandler
+    handler = _EventHandler(MagicMock(), ['.git', 'node_modules', 'build/*'], root_path='/repo')
+
+    assert handler._is_ignored('/repo/.git/index')
+    assert handler._is_ignored('/repo/web/node_modules/pkg/index.js')
+    assert handler._is_ignored('/repo/build/output.bin')
+    assert not handler._is_ignored('/repo/src/main.py')
+    assert not handler._is_ignored('/elsewhere/.gitignore')
+
+def test_event_handler_drops_non_change_events():
+    """Opened/closed notifications from native observers are not queued."""
+    from core.watcher import _EventHandler
+    event_queue = MagicMock()
+    handler = _EventHandler(event_queue, [], root_path='/repo')
+
+    handler.on_any_event(MagicMock(event_type='closed', is_directory=False, src_path='/repo/a.py'))
+    handler.on_any_event(MagicMock(event_type='modified', is_directory=False, src_path='/repo/a.py'))
+
+    assert event_queue.put.call_count == 1
+
+def test_event_handler_reports_removed_directories():
+    """A deleted or moved folder is reported through the callback instead of the queue."""
+    from core.watcher import _EventHandler
+    event_queue = MagicMock()
+    on_directory_removed = MagicMock()
+    handler = _EventHandler(event_queue, ['.git'], root_path='/repo', on_directory_removed=on_directory_removed)
+
+    handler.on_any_event(MagicMock(event_type='moved', is_directory=True, src_path='/repo/src'))
+    handler.on_any_event(MagicMock(event_type='created', is_directory=True, src_path='/repo/docs'))
+    handler.on_any_event(MagicMock(event_type='deleted', is_directory=True, src_path='/repo/.git/refs'))
+
+    assert on_directory_removed.call_count == 1
+    event_queue.put.assert_not_called()
+
+def test_event_handler_ignore_rules_are_case_insensitive_on_windows():
+    """Ignore rules go through os.path.normcase, like fnmatch.fnmatch did."""
+    import ntpath
+    from core.watcher import _EventHandler
+    with patch('os.path.normcase', ntpath.normcase):
+        handler = _EventHandler(MagicMock(), ['node_modules', '*.pyc'])
+
+        assert handler._is_ignored('/repo/Node_Modules')
+        assert handler._is_ignored('/repo/cache.PYC')
+        assert not handler._is_ignored('/repo/main.py')
+
+def test_watcher_change_history_is_bounded(temp_watched_dir, qtbot):
+    """Old creates/deletes are dropped past the cap; earlier timestamps then get no answer."""
+    import itertools
+    watcher = FileWatcher(str(temp_watched_dir), [])
+    watcher.started_at = watcher._history_start = 100.0
+    clock = itertools.count(101.0)
+    with patch('core.watcher.MAX_TRACKED_CHANGES', 2), patch.object(watcher, 'isRunning', return_value=True), \
+            patch('core.watcher.time.time', side_effect=lambda: next(clock)):
+        watcher._track_presence({'action': 'deleted', 'src_path': '/repo/old.py', 'dst_path': None})  # t=101
+        for name in ('a.py', 'b.py', 'c.py'):  # t=102..104
+            watcher._track_presence({'action': 'created', 'src_path': f'/repo/{name}', 'dst_path': None})
+
+    assert len(watcher._created_at) == 2
+    assert watcher._history_start == 102.0
+    with patch.object(watcher, 'isRunning', return_value=True):
+        assert watcher.file_changes_since(100.5) is None
+        assert watcher.file_changes_since(102.5) == ({'/repo/b.py', '/repo/c.py'}, set())
+        assert watcher.file_changes_since(103.5) == ({'/repo/c.py'}, set())
@@ -82,6 +82,46 @@ def test_checksum_verification_success(temp_dir):
     loaded = workspace_manager.load_workspaces(base_path=temp_dir)
     assert loaded["last_active_workspace"] == "TestWS"
 
+def test_load_workspaces_reuses_parse_until_file_changes(temp_dir):
+    """Test that repeated loads reuse the parsed file but still see external edits."""
+    workspace_manager.save_workspaces(
+        {"workspaces": {"TestWS": {"folder_path": "path/a"}}, "last_active_workspace": "TestWS"},
+        base_path=temp_dir)
+
+    with patch.object(workspace_manager, '_parse_and_verify', wraps=workspace_manager._parse_and_verify) as mock_parse:
+        first = workspace_manager.load_workspaces(base_path=temp_dir)
+        first["last_active_workspace"] = "Mutated"
+        second = workspace_manager.load_workspaces(base_path=temp_dir)
+        assert mock_parse.call_count == 1
+    assert second["last_active_workspace"] == "TestWS"
+
+    workspace_manager.save_workspaces(
+        {"workspaces": {"OtherWS": {"folder_path": "path/b"}}, "last_active_workspace": "OtherWS"},
+        base_path=temp_dir)
+    assert workspace_manager.load_workspaces(base_path=temp_dir)["last_active_workspace"] == "OtherWS"
+
+def test_save_unchanged_workspaces_skips_disk_work(temp_dir):
+    """Test that saving the same data again writes neither the file nor a backup."""
+    data = {"workspaces": {"TestWS": {"folder_path": "path/a"}}, "last_active_workspace": "TestWS"}
+    assert workspace_manager.save_workspaces(data, base_path=temp_dir) is True
+
+    workspace_file = temp_dir / workspace_manager.WORKSPACE_FILE
+    mtime_before = workspace_file.stat().st_mtime_ns
+    backups_before = sorted(os.listdir(temp_dir / 'backups'))
+
+    with patch.object(workspace_manager, '_dumps_with_checksum') as mock_dumps:
+        assert workspace_manager.save_workspaces(data, base_path=temp_dir) is False
+        mock_dumps.assert_not_called()
+
+    assert workspace_file.stat().st_mtime_ns == mtime_before
+    assert sorted(os.listdir(temp_dir / 'backups')) == backups_before
+
+def test_sets_are_written_in_sorted_order():
+    """Sets serialize sorted, so the file and its checksum do not depend on hash order."""
+    payload = workspace_manager._dumps_with_checksum({"paths": {"c.py", "a.py", "b.py"}})
+
+    assert json.loads(payload)["paths"] == ["a.py", "b.py", "c.py"]
+
 def test_checksum_mismatch_triggers_fallback(temp_dir):
     """Test that a tampered file fails checksum and triggers fallback to default."""
     workspace_file = temp_dir / workspace_manager.WORKSPACE_FILE
@@ -1,8 +1,13 @@
+import logging
+
 from PySide6.QtCore import QObject, Slot, Signal
 from PySide6.QtWidgets import QFileDialog, QDialog
 from dialogs.scan_config_dialog import ScanConfigDialog
 from core.workspace_manager import get_default_scan_settings
 
+# Debug-level only: arguments are formatted lazily, so quiet runs skip the string work
+log = logging.getLogger(__name__)
+
 class ScanController(QObject):
     folder_selected = Signal(str)
 
@@ -13,43 +18,43 @@ class ScanController(QObject):
 
     # ---------------- public API ----------------
     def select_folder(self):
-        print(f"[SCAN_CTRL] 📁 Opening folder selection dialog...")
+        log.debug("[SCAN_CTRL] 📁 Opening folder selection dialog...")
         folder = QFileDialog.getExistingDirectory(self.mw, "Select Project Folder")
-        print(f"[SCAN_CTRL] 📁 User selected folder: {folder}")
+        log.debug("[SCAN_CTRL] 📁 User selected folder: %s", folder)
         if not folder:
-            print(f"[SCAN_CTRL] ❌ No folder selected, returning")
+            log.debug("[SCAN_CTRL] ❌ No folder selected, returning")
             return
 
-        print(f"[SCAN_CTRL] 📡 Emitting folder_selected signal...")
+        log.debug("[SCAN_CTRL] 📡 Emitting folder_selected signal...")
         self.folder_selected.emit(folder)
-        print(f"[SCAN_CTRL] 🔧 Opening scan config dialog with fresh default settings...")
+        log.debug("[SCAN_CTRL] 🔧 Opening scan config dialog with fresh default settings...")
         # Use fresh default settings for new folders, not current settings
         default_settings = get_default_scan_settings()
         dlg = ScanConfigDialog(folder, default_settings, self.mw)
-        print(f"[SCAN_CTRL] 🔧 Executing scan config dialog...")
+        log.debug("[SCAN_CTRL] 🔧 Executing scan config dialog...")
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            print(f"[SCAN_CTRL] ✅ Dialog accepted, starting scan...")
+            log.debug("[SCAN_CTRL] ✅ Dialog accepted, starting scan...")
             self.start(folder, dlg.get_settings())
         else:
-            print(f"[SCAN_CTRL] ❌ Dialog cancelled or rejected")
+            log.debug("[SCAN_CTRL] ❌ Dialog cancelled or rejected")
 
     def start(self, folder_path, settings, checked_paths_to_restore=None):
         """Start scanning with automatic workspace saving."""
-        print(f"[SCAN_CTRL] 💾 Saving workspace state before new scan...")
+        log.debug("[SCAN_CTRL] 💾 Saving workspace state before new scan...")
         self.mw._update_current_workspace_state()
         self.mw._save_current_workspace_state()
         
-        print(f"[SCAN_CTRL] 🚀 Starting scan for: {folder_path}")
-        print(f"[SCAN_CTRL] ⚙️ Scan settings: {settings}")
+        log.debug("[SCAN_CTRL] 🚀 Starting scan for: %s", folder_path)
+        log.debug("[SCAN_CTRL] ⚙️ Scan settings: %s", settings)
         
         self.mw.current_folder_path = folder_path
         self.mw.current_scan_settings = settings
         
         if checked_paths_to_restore:
-            print(f"[SCAN_CTRL] 🔄 Restoring {len(checked_paths_to_restore)} checked paths")
+            log.debug("[SCAN_CTRL] 🔄 Restoring %d checked paths", len(checked_paths_to_restore))
             self.pending_restore_paths = set(checked_paths_to_restore)
         else:
-            print(f"[SCAN_CTRL] 🆕 No paths to restore, clearing pending")
+            log.debug("[SCAN_CTRL] 🆕 No paths to restore, clearing pending")
             self.pending_restore_paths.clear()
 
         self.mw.tree_panel.clear_tree()
@@ -57,11 +62,11 @@ class ScanController(QObject):
         self.mw.statusBar().showMessage(f"Scanning {folder_path}...")
         
         # Use ONLY the streamlined scanner - fast and simple
-        print(f"[SCAN_CTRL] 🚀 Using streamlined scanner (bg_scanner process only)")
+        log.debug("[SCAN_CTRL] 🚀 Using streamlined scanner (bg_scanner process only)")
         success = self.mw.streamlined_scanner.start_scan(folder_path, settings)
         
         if not success:
-            print(f"[SCAN_CTRL] ❌ Failed to start streamlined scan")
+            log.warning("[SCAN_CTRL] ❌ Failed to start streamlined scan")
             self.mw.tree_panel.show_loading(False)
             self.mw.statusBar().showMessage("Failed to start scan", 3000)
         
@@ -76,7 +81,7 @@ class ScanController(QObject):
         self.mw.tree_panel.set_pending_restore_paths(pending)
         
         # Use ONLY the streamlined scanner - no complex optimistic loading
-        print(f"[SCAN_CTRL] 🚀 Refreshing with streamlined scanner...")
+        log.debug("[SCAN_CTRL] 🚀 Refreshing with streamlined scanner...")
         self.start(self.mw.current_folder_path, self.mw.current_scan_settings)
     
     def start_scan(self, folder_path, settings):
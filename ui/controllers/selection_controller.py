@@ -1,9 +1,68 @@
+import logging
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtCore import QObject, Slot
 from PySide6.QtWidgets import QDialog, QMessageBox
 from core import selection_manager
 from ui.dialogs.edit_selection_group_dialog import EditSelectionGroupDialog
 
+# Debug-level only: arguments are formatted lazily, so quiet runs skip the string work
+log = logging.getLogger(__name__)
+
+# Folder listings are IO-bound, so drift checks of several folders run concurrently
+DRIFT_SCAN_MAX_WORKERS = 8
+
+
+def _scan_folder_for_drift(folder, paths_by_name, last_saved_time):
+    """List one folder of a selection group and return (missing_paths, new_file_paths).
+
+    paths_by_name maps file names in this folder to their selected paths.
+    New files are only looked for when last_saved_time is known.
+    """
+    if last_saved_time is not None:
+        try:
+            # Adding or removing an entry bumps the folder's mtime, so a folder
+            # untouched since the group was saved has nothing to report
+            if os.stat(folder).st_mtime <= last_saved_time:
+                return [], []
+        except OSError:
+            pass  # The listing below handles missing folders
+    try:
+        with os.scandir(folder) as it:
+            entries = {entry.name: entry for entry in it}
+    except OSError:
+        # Folder gone or unreadable: fall back to checking each selected file
+        return [path for path in paths_by_name.values() if not os.path.lexists(path)], []
+
+    # Names the listing lacks are confirmed with an lstat (case-insensitive filesystems);
+    # a symlink counts as present, matching the listing, even if its target is gone
+    missing = [path for name, path in paths_by_name.items()
+               if name not in entries and not os.path.lexists(path)]
+
+    new = []
+    if last_saved_time is not None:
+        # The folder came from an already normalized path, so new paths are built by concatenation
+        folder_prefix = folder.replace('\\', '/').rstrip('/') + '/'
+        for name, entry in entries.items():
+            # Skip files already in the selection before touching the entry at all
+            if name in paths_by_name:
+                continue
+            try:
+                # is_file() answers from the listing's d_type except for symlinks
+                if not entry.is_file():
+                    continue
+
+                stats = entry.stat()
+                created_time = getattr(stats, "st_ctime", stats.st_mtime)
+                # 1s buffer to reduce race conditions
+                if created_time > (last_saved_time + 1.0):
+                    new.append(folder_prefix + name)
+            except OSError:
+                pass
+    return missing, new
+
+
 class SelectionController(QObject):
     def __init__(self, main_window):
         super().__init__(main_window)
@@ -17,14 +76,33 @@ class SelectionController(QObject):
                 self.mw.active_selection_group
             )
 
+    def _schedule_save(self):
+        """Persist group changes through the window's debounced background save."""
+        timer = getattr(self.mw, '_save_debounce_timer', None)
+        if timer is not None:
+            # Restarting the single-shot timer coalesces rapid edits into one write
+            timer.start()
+
+    def _scan_for_drift(self, paths_by_folder, last_saved_time):
+        """List each selected folder; returns one (missing, new) pair per folder."""
+        folders = list(paths_by_folder.items())
+        if len(folders) > 1:
+            with ThreadPoolExecutor(max_workers=min(DRIFT_SCAN_MAX_WORKERS, len(folders))) as executor:
+                return list(executor.map(
+                    lambda item: _scan_folder_for_drift(item[0], item[1], last_saved_time), folders))
+        return [_scan_folder_for_drift(folder, paths_by_name, last_saved_time)
+                for folder, paths_by_name in folders]
+
     def _detect_and_resolve_drift(self, stored_paths: set, group_data: dict) -> set:
         """Smart drift detection.
 
         1. Missing Files: File is in selection but gone from disk.
-        2. New Files: File creation / modification time > group saved time.
+        2. New Files: File in a selected folder that is not selected and appeared
+           after the group was saved. A running file watcher reports files created
+           or moved in. Otherwise only folders whose mtime shows an added or removed
+           entry since the save are listed; there unselected files go by ctime,
+           which on Unix also counts files whose contents or metadata changed.
         """
-        import os
-
         final_paths = stored_paths.copy()
         missing_files = []
         new_candidates = []
@@ -32,42 +110,29 @@ class SelectionController(QObject):
         # 1. Get Last Saved Timestamp (legacy groups may not have this)
         last_saved_time = group_data.get("last_updated", None)
 
-        # 2. Detect Missing Files
+        # 2. Group the selection by folder: one listing per folder answers both checks
+        paths_by_folder = defaultdict(dict)
         for path in stored_paths:
-            if not os.path.exists(path):
-                missing_files.append(path)
-
-        # 3. Detect TRULY New Files (time-based) only if we have a timestamp
-        if last_saved_time is not None:
-            scanned_folders = set()
-            for path in stored_paths:
-                folder = os.path.dirname(path)
-                if folder in scanned_folders or not os.path.exists(folder):
-                    continue
+            folder, name = os.path.split(path)
+            paths_by_folder[folder][name] = path
 
-                scanned_folders.add(folder)
-                try:
-                    with os.scandir(folder) as entries:
-                        for entry in entries:
-                            if not entry.is_file():
-                                continue
-
-                            norm_path = os.path.normpath(entry.path).replace('\\', '/')
-
-                            # Skip files already in the selection
-                            if norm_path in stored_paths:
-                                continue
-
-                            try:
-                                stats = entry.stat()
-                                created_time = getattr(stats, "st_ctime", stats.st_mtime)
-                                # 1s buffer to reduce race conditions
-                                if created_time > (last_saved_time + 1.0):
-                                    new_candidates.append(norm_path)
-                            except OSError:
-                                pass
-                except OSError:
-                    pass
+        # 3. Detect missing files and TRULY new files (time-based, only if we have a timestamp)
+        # A live file watcher that has run since the save already knows both; no listing needed.
+        # A removed or moved folder only reports itself, not its files, so that needs the listing
+        watcher = getattr(self.mw, 'file_watcher', None)
+        changes = None
+        if watcher and last_saved_time is not None and not watcher.directory_removed_since(last_saved_time):
+            # 1s buffer to reduce race conditions, as in the folder scan
+            changes = watcher.file_changes_since(last_saved_time + 1.0)
+        if changes is not None:
+            created, deleted = changes
+            missing_files = [path for path in stored_paths if path in deleted]
+            new_candidates = [path for path in created
+                              if path not in stored_paths and os.path.dirname(path) in paths_by_folder]
+        else:
+            for missing, new in self._scan_for_drift(paths_by_folder, last_saved_time):
+                missing_files.extend(missing)
+                new_candidates.extend(new)
 
         # 4. Exit early if nothing changed
         if not missing_files and not new_candidates:
@@ -125,21 +190,7 @@ class SelectionController(QObject):
         stored_paths = group_data.get("checked_paths", [])
         
         # 2. Convert to absolute paths with forced Forward Slashes
-        absolute_paths = set()
-        workspace_root = self.mw.current_folder_path
-        
-        if workspace_root:
-            for path in stored_paths:
-                # Normalize to forward slashes for consistency with Tree Model
-                if os.path.isabs(path):
-                    norm = os.path.normpath(path).replace('\\', '/')
-                    absolute_paths.add(norm)
-                else:
-                    full = os.path.join(workspace_root, path)
-                    norm = os.path.normpath(full).replace('\\', '/')
-                    absolute_paths.add(norm)
-        else:
-            absolute_paths = {os.path.normpath(p).replace('\\', '/') for p in stored_paths}
+        absolute_paths = set(selection_manager.to_absolute_paths(stored_paths, self.mw.current_folder_path))
 
         # CHECK FOR DRIFT (time-aware, using group_data)
         absolute_paths = self._detect_and_resolve_drift(absolute_paths, group_data)
@@ -155,6 +206,11 @@ class SelectionController(QObject):
             self.mw.file_changes_panel.update_active_selection(absolute_paths)
 
         # 5. Update UI State
+        # The restore's own check-change burst is not a user edit, and the update below
+        # replaces its debounced refresh
+        timer = getattr(self.mw, '_selection_update_timer', None)
+        if timer is not None:
+            timer.stop()
         self.mw.selection_manager_panel.set_dirty(False)
         if hasattr(self.mw, 'update_aggregation_and_tokens'):
             self.mw.update_aggregation_and_tokens()
@@ -167,7 +223,7 @@ class SelectionController(QObject):
         
         ws = self.mw.workspaces['workspaces'][self.mw.current_workspace_name]
         selection_manager.save_group(ws, name, "", paths)  # description handled in Edit dialog
-        print(f"[SELECTION] ✅ Group '{name}' saved with {len(paths)} paths")
+        log.debug("[SELECTION] ✅ Group '%s' saved with %d paths", name, len(paths))
 
         # Update workspace state
         self.mw.selection_groups = selection_manager.load_groups(ws)
@@ -189,6 +245,7 @@ class SelectionController(QObject):
             self.mw.file_changes_panel.add_system_message(f"Saved group: '{name}' with {len(paths)} files")
             current_abs = self.mw.tree_panel.get_checked_paths(relative=False, return_set=True)
             self.mw.file_changes_panel.update_active_selection(current_abs)
+        self._schedule_save()
 
     @Slot()
     def new_group(self):
@@ -203,6 +260,7 @@ class SelectionController(QObject):
         if hasattr(self.mw, 'file_changes_panel'):
             self.mw.file_changes_panel.add_system_message(f"Created new group: {name}")
             self.mw.file_changes_panel.update_active_selection(set())
+        self._schedule_save()
 
     @Slot(str)
     def edit_group(self, group_name):
@@ -219,6 +277,7 @@ class SelectionController(QObject):
             selection_manager.save_group(ws, new_name, result["description"], set(result["checked_paths"]))
             self.mw.active_selection_group = new_name
             self.mw.selection_manager_panel.update_groups(list(self.mw.selection_groups.keys()), new_name)
+            self._schedule_save()
 
     @Slot(str)
     def delete_group(self, group_name):
@@ -235,3 +294,4 @@ class SelectionController(QObject):
         # Log
         if hasattr(self.mw, 'file_changes_panel'):
             self.mw.file_changes_panel.add_system_message(f"Deleted group: '{group_name}'")
+        self._schedule_save()
@@ -2,9 +2,10 @@
 
 """Modal dialog for editing a selection group's properties."""
 
+from PySide6.QtCore import QStringListModel
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLineEdit, QPlainTextEdit,
-    QListWidget, QLabel, QDialogButtonBox, QPushButton, QAbstractItemView
+    QListView, QLabel, QDialogButtonBox, QPushButton, QAbstractItemView
 )
 
 
@@ -24,9 +25,13 @@ class EditSelectionGroupDialog(QDialog):
         self.name_edit = QLineEdit(group_name)
         self.description_edit = QPlainTextEdit(group_data.get("description", ""))
         
-        self.path_list = QListWidget()
+        # A string list model avoids creating one item object per path for large groups
+        self.path_model = QStringListModel(sorted(group_data.get("checked_paths", [])), self)
+        self.path_list = QListView()
+        self.path_list.setModel(self.path_model)
+        self.path_list.setUniformItemSizes(True)
+        self.path_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.path_list.setSelectionMode(QAbstractItemView.NoSelection)
-        self.path_list.addItems(sorted(group_data.get("checked_paths", [])))
 
         file_count = len(group_data.get("checked_paths", []))
         self.status_label = QLabel(f"Status: {file_count} files / 0 tokens") # Token count is a placeholder
@@ -74,15 +79,14 @@ class EditSelectionGroupDialog(QDialog):
         ok_button.setEnabled(is_valid)
         if is_valid:
             # Preserve existing status text about file count when name is valid
-            file_count = self.path_list.count()
+            file_count = self.path_model.rowCount()
             self.status_label.setText(f"Status: {file_count} files / 0 tokens")
         else:
             self.status_label.setText(message)
 
     def set_current_selection(self, paths: list[str]):
         """Updates the list widget with the current tree selection."""
-        self.path_list.clear()
-        self.path_list.addItems(sorted(paths))
+        self.path_model.setStringList(sorted(paths))
         file_count = len(paths)
         self.status_label.setText(f"Reset to {file_count} files from active tree")
 
@@ -91,5 +95,5 @@ class EditSelectionGroupDialog(QDialog):
         return {
             "name": self.name_edit.text().strip(),
             "description": self.description_edit.toPlainText(),
-            "checked_paths": [self.path_list.item(i).text() for i in range(self.path_list.count())],
+            "checked_paths": self.path_model.stringList(),
         }
@@ -1,31 +1,82 @@
 from PySide6.QtCore import QObject, Signal
 import os
-import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Minimum seconds between progress/token signals sent to the GUI thread
+PROGRESS_MIN_INTERVAL = 0.1
+
+# Files are read ahead on worker threads (file I/O releases the GIL) while
+# the worker formats and chunks the previous ones, one batch at a time
+AGG_READ_MAX_WORKERS = 4
+AGG_READ_BATCH_SIZE = 64
+
+# Files whose first BINARY_SNIFF_BYTES hold a null byte or mostly control
+# characters are skipped as binary, without reading the rest
+BINARY_SNIFF_BYTES = 512
+BINARY_CONTROL_RATIO = 0.3
+# Bytes that occur in text: printable ASCII, common whitespace/escapes, and anything >= 0x80 (UTF-8)
+_TEXT_BYTES = bytes({7, 8, 9, 10, 11, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
 
 def generate_file_tree_string(current_folder_path: str, relative_paths: set) -> str:
     """Generate a file tree representation from a set of relative paths."""
     path_tree = {}
     for rel_path in relative_paths:
-        parts = pathlib.Path(rel_path).parts
+        # Plain string split; empty and '.' parts are dropped as pathlib would
         d = path_tree
-        for part in parts:
-            d = d.setdefault(part, {})
+        for part in rel_path.replace('\\', '/').split('/'):
+            if part and part != '.':
+                d = d.setdefault(part, {})
     
-    def build(node, indent=0):
-        lines = []
+    root_name = os.path.basename(current_folder_path.rstrip('/\\'))
+    lines = [f"{root_name}/"]
+    # Iterative DFS: the stack holds (name, children, indent, is_last) still to be printed,
+    # pushed in reverse so entries pop in sorted order (files before folders)
+    stack = []
+
+    def push_children(node, indent):
         items = sorted(node.items(), key=lambda x: (bool(x[1]), x[0]))
-        for i, (name, children) in enumerate(items):
-            is_last = (i == len(items) - 1)
-            prefix = "└── " if is_last else "├── "
-            suffix = "/" if children else ""
-            lines.append(" " * (indent * 4) + prefix + name + suffix)
-            if children:
-                child_lines = build(children, indent + 1)
-                lines.extend(child_lines)
-        return lines
-    
-    root_name = pathlib.Path(current_folder_path).name
-    return "\n".join([f"{root_name}/"] + build(path_tree))
+        last_index = len(items) - 1
+        for i in range(last_index, -1, -1):
+            name, children = items[i]
+            stack.append((name, children, indent, i == last_index))
+
+    push_children(path_tree, 0)
+    while stack:
+        name, children, indent, is_last = stack.pop()
+        prefix = "└── " if is_last else "├── "
+        suffix = "/" if children else ""
+        lines.append(" " * (indent * 4) + prefix + name + suffix)
+        if children:
+            push_children(children, indent + 1)
+    return "\n".join(lines)
+
+
+def _looks_binary(head):
+    """git-style sniff of a file's first bytes: any null byte, or too many control characters."""
+    if b'\x00' in head:
+        return True
+    return bool(head) and len(head.translate(None, _TEXT_BYTES)) / len(head) > BINARY_CONTROL_RATIO
+
+
+def _read_text(file_path):
+    """Read a file as text the way open(..., 'r', errors='replace') would.
+
+    Returns (content, null_count), or None if the file looks binary. The bytes
+    are decoded in one call, and the newline translation and null-byte scan
+    only run when the raw bytes need them.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(BINARY_SNIFF_BYTES)
+        if _looks_binary(head):
+            return None
+        data = head + f.read()
+    content = data.decode('utf-8', errors='replace')
+    if b'\r' in data:
+        # Universal newlines, as text mode would apply them
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    null_count = data.count(b'\x00') if b'\x00' in data else 0
+    return content, null_count
 
 
 
@@ -35,14 +86,20 @@ class AggregationWorker(QObject):
     progress_update = Signal(int, int)  # current_file, total_files
     token_update = Signal(int)          # current_token_count
 
-    # List of binary extensions to explicitly skip
-    BINARY_EXTENSIONS = {'.DS_Store', '.pyc', '.git', '.bin', '.exe', '.dll', '.so', '.dylib'}
+    # Binary files to explicitly skip, matched case-insensitively
+    _BINARY_NAMES = frozenset({'.ds_store', '.git'})
+    _BINARY_EXTS = frozenset({'.pyc', '.git', '.bin', '.exe', '.dll', '.so', '.dylib'})
 
     def __init__(self, file_paths, mode='xml'):
         super().__init__()
         self.file_paths = file_paths
         self.mode = mode
         self.is_running = True
+        # The per-file wrapper only depends on the mode, so pick it once
+        if mode == 'markdown':
+            self._template = "\n## File: {path}\n```\n{content}\n```\n"
+        else:  # XML default
+            self._template = "\n<file path=\"{path}\">\n{content}\n</file>\n"
 
     def run(self):
         chunks = []
@@ -53,71 +110,98 @@ class AggregationWorker(QObject):
         # Internal chunk limit (~500k chars) to prevent memory spikes
         CHUNK_SIZE_LIMIT = 500000 
 
-        total_files = len(self.file_paths)
-        
-        for i, file_path in enumerate(self.file_paths):
-            if not self.is_running:
-                break
-                
-            self.progress_update.emit(i + 1, total_files)
-            
-            # 1. Binary File Check
-            filename = os.path.basename(file_path)
-            _, ext = os.path.splitext(filename)
-            
-            if filename in self.BINARY_EXTENSIONS or ext in self.BINARY_EXTENSIONS:
-                print(f"[AGG_WORKER] ⏭️ Skipping binary file: {filename}")
-                continue
-            
-            try:
-                # 2. Read & Sanitize
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                    
-                # CRITICAL FIX: Strip Null Bytes (\x00)
-                if '\x00' in content:
-                    # Log if we are stripping null bytes for verification
-                    null_count = content.count('\x00')
-                    if null_count > 0:
+        file_paths = list(self.file_paths)
+        total_files = len(file_paths)
+        files_seen = 0
+        # Progress is coalesced: each emit is a queued call into the GUI thread
+        last_emit_time = None
+        read_futures = []
+
+        with ThreadPoolExecutor(max_workers=AGG_READ_MAX_WORKERS) as executor:
+            for batch_start in range(0, total_files, AGG_READ_BATCH_SIZE):
+                if not self.is_running:
+                    break
+                batch = file_paths[batch_start:batch_start + AGG_READ_BATCH_SIZE]
+
+                # 1. Read the batch on worker threads (binary files are never read)
+                read_futures = [executor.submit(self._read_file, file_path) for file_path in batch]
+
+                for offset, (file_path, future) in enumerate(zip(batch, read_futures)):
+                    if not self.is_running:
+                        break
+                    files_seen = batch_start + offset + 1
+
+                    now = time.monotonic()
+                    if last_emit_time is None or now - last_emit_time >= PROGRESS_MIN_INTERVAL:
+                        last_emit_time = now
+                        self.progress_update.emit(files_seen, total_files)
+                        self.token_update.emit(total_tokens)
+
+                    filename = os.path.basename(file_path)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"[AGG_WORKER] ❌ Error reading {file_path}: {e}")
+                        continue
+                    if result is None:
+                        print(f"[AGG_WORKER] ⏭️ Skipping binary file: {filename}")
+                        continue
+
+                    # 2. Sanitize
+                    content, null_count = result
+
+                    # CRITICAL FIX: Strip Null Bytes (\x00)
+                    if null_count:
+                        # Log if we are stripping null bytes for verification
                         print(f"[AGG_WORKER] ⚠️ Found {null_count} null bytes in {filename}. Cleaning...")
-                    content = content.replace('\x00', '')
-                
-                formatted_content = self._format_content(file_path, content)
-                content_len = len(formatted_content)
-                
-                # 3. Token Estimate (4 chars ~= 1 token)
-                estimated_tokens = content_len // 4
-                total_tokens += estimated_tokens
-                self.token_update.emit(total_tokens)
-
-                # 4. Internal Chunking
-                if current_chunk_size + content_len > CHUNK_SIZE_LIMIT:
-                    chunks.append("".join(current_chunk_content))
-                    current_chunk_content = []
-                    current_chunk_size = 0
-                
-                current_chunk_content.append(formatted_content)
-                current_chunk_size += content_len
-                
-            except Exception as e:
-                print(f"[AGG_WORKER] ❌ Error reading {file_path}: {e}")
-                continue
+                        content = content.replace('\x00', '')
+
+                    formatted_content = self._format_content(file_path, content)
+                    content_len = len(formatted_content)
+
+                    # 3. Token Estimate (4 chars ~= 1 token)
+                    estimated_tokens = content_len // 4
+                    total_tokens += estimated_tokens
+
+                    # 4. Internal Chunking
+                    if current_chunk_size + content_len > CHUNK_SIZE_LIMIT:
+                        chunks.append("".join(current_chunk_content))
+                        current_chunk_content = []
+                        current_chunk_size = 0
+
+                    current_chunk_content.append(formatted_content)
+                    current_chunk_size += content_len
+
+            if not self.is_running:
+                # Drop reads that have not started yet
+                for future in read_futures:
+                    future.cancel()
 
         # Flush remaining content
         if current_chunk_content:
             chunks.append("".join(current_chunk_content))
 
+        # Final values always reach the UI before finished
+        self.progress_update.emit(files_seen, total_files)
+        self.token_update.emit(total_tokens)
+
         self.finished.emit({
             "chunks": chunks,
             "total_tokens": total_tokens,
             "file_count": total_files
         })
 
+    def _read_file(self, file_path):
+        """Runs on a reader thread: (content, null_count), or None for binary files."""
+        name_l = os.path.basename(file_path).lower()
+        if name_l in self._BINARY_NAMES or os.path.splitext(name_l)[1] in self._BINARY_EXTS:
+            return None
+        if not self.is_running:
+            return "", 0  # Cancelled; the result is never used
+        return _read_text(file_path)
+
     def _format_content(self, path, content):
-        if self.mode == 'markdown':
-            return f"\n## File: {path}\n```\n{content}\n```\n"
-        else:  # XML default
-            return f"\n<file path=\"{path}\">\n{content}\n</file>\n"
+        return self._template.format(path=path, content=content)
 
     def stop(self):
         self.is_running = False
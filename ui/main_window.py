@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (
     QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout,
     QSplitter, QLabel, QStyle
 )
-from PySide6.QtCore import Qt, Slot, QTimer, QFileSystemWatcher, QThread, Signal, QMutex
+from PySide6.QtCore import Qt, Slot, QTimer, QFileSystemWatcher, QThread, Signal, QMutex, QModelIndex
 
 # Core components
 from core import workspace_manager, selection_manager
@@ -62,7 +62,8 @@ class AggregationWorker(QThread):
     def run(self):
         import os
         import time
-        from ui.helpers.aggregation_helper import generate_file_tree_string
+        from concurrent.futures import ThreadPoolExecutor
+        from ui.helpers.aggregation_helper import generate_file_tree_string, AGG_READ_MAX_WORKERS, AGG_READ_BATCH_SIZE
         from core.helpers import calculate_tokens
 
         try:
@@ -124,101 +125,120 @@ class AggregationWorker(QThread):
             agg_loop_start = time.time()
             files_processed = 0
 
-            for i, rel_path in enumerate(sorted_paths):
-                if self._is_cancelled:
-                    out.close()
-                    return
-                    
-                # Update progress
-                if total_files > 0 and (i % 10 == 0 or i == 0):
-                    percent = int((processed_bytes / total_bytes) * 100) if total_bytes > 0 else int((i / total_files) * 100)
-                    self.progress_signal.emit(percent)
-                    self.token_progress_signal.emit(total_tokens)
-                    self.msleep(1)
-
-                abs_path = os.path.join(self.folder_path, rel_path)
+            def read_selected(abs_path):
+                # Runs on a reader thread; None for paths that are not files
                 if not os.path.isfile(abs_path):
-                    continue
-                
-                # Skip known binary files that would break clipboard with null bytes
-                binary_patterns = {'.DS_Store', '.pyc', '.pyo', '.so', '.dll', '.exe', '.bin', '.obj'}
-                if any(abs_path.endswith(pattern) for pattern in binary_patterns):
-                    print(f"[AGG_WORKER] ⏭️ Skipping binary file: {rel_path}")
-                    continue
-
-                try:
-                    # Read entire file content first
-                    # Use errors='replace' to handle binary content gracefully
-                    with open(abs_path, "r", encoding="utf-8", errors="replace") as f:
-                        file_content = f.read()
+                    return None
+                # Use errors='replace' to handle binary content gracefully
+                with open(abs_path, "r", encoding="utf-8", errors="replace") as f:
+                    return f.read()
+
+            # Skip known binary files that would break clipboard with null bytes
+            binary_patterns = ('.DS_Store', '.pyc', '.pyo', '.so', '.dll', '.exe', '.bin', '.obj')
+
+            # Files are read a batch ahead on worker threads (file I/O releases the GIL)
+            # while this thread tokenizes and writes them in order
+            with ThreadPoolExecutor(max_workers=AGG_READ_MAX_WORKERS) as executor:
+                for batch_start in range(0, total_files, AGG_READ_BATCH_SIZE):
+                    batch = sorted_paths[batch_start:batch_start + AGG_READ_BATCH_SIZE]
+                    read_futures = [
+                        None if rel_path.endswith(binary_patterns)
+                        else executor.submit(read_selected, os.path.join(self.folder_path, rel_path))
+                        for rel_path in batch
+                    ]
+                    for i, rel_path, future in zip(range(batch_start, total_files), batch, read_futures):
+                        if self._is_cancelled:
+                            out.close()
+                            # Drop reads that have not started yet
+                            for pending in read_futures:
+                                if pending is not None:
+                                    pending.cancel()
+                            return
+                    
+                        # Update progress
+                        if total_files > 0 and (i % 10 == 0 or i == 0):
+                            percent = int((processed_bytes / total_bytes) * 100) if total_bytes > 0 else int((i / total_files) * 100)
+                            self.progress_signal.emit(percent)
+                            self.token_progress_signal.emit(total_tokens)
+                            self.msleep(1)
+
+                        if future is None:
+                            print(f"[AGG_WORKER] ⏭️ Skipping binary file: {rel_path}")
+                            continue
+
+                        try:
+                            # Entire file content, read ahead on a reader thread
+                            file_content = future.result()
+                            if file_content is None:
+                                continue  # Not a file (deleted or a folder)
                     
-                    # Additional check: Skip if file contains too many null bytes (likely binary)
-                    null_byte_count = file_content.count('\x00')
-                    if null_byte_count > 10:  # More than 10 null bytes = probably binary
-                        print(f"[AGG_WORKER] ⏭️ Skipping binary-like file (has {null_byte_count} null bytes): {rel_path}")
-                        continue
+                            # Additional check: Skip if file contains too many null bytes (likely binary)
+                            null_byte_count = file_content.count('\x00')
+                            if null_byte_count > 10:  # More than 10 null bytes = probably binary
+                                print(f"[AGG_WORKER] ⏭️ Skipping binary-like file (has {null_byte_count} null bytes): {rel_path}")
+                                continue
                     
-                    # Skip empty files
-                    if not file_content:
-                        continue
+                            # Skip empty files
+                            if not file_content:
+                                continue
                     
-                    # Calculate accurate token count for this file
-                    file_tokens = calculate_tokens(file_content)
+                            # Calculate accurate token count for this file
+                            file_tokens = calculate_tokens(file_content)
                     
-                    # Calculate file size for progress tracking
-                    file_bytes = len(file_content.encode("utf-8", errors="ignore"))
-                    processed_bytes += file_bytes
+                            # Calculate file size for progress tracking
+                            file_bytes = len(file_content.encode("utf-8", errors="ignore"))
+                            processed_bytes += file_bytes
                     
-                    # Prepare file header and footer
-                    _, ext = os.path.splitext(rel_path)
-                    lang = ext[1:].lower() if ext else ""
-                    file_header = f"\n`{rel_path}`\n```{lang}\n"
-                    file_footer = "\n```\n"
+                            # Prepare file header and footer
+                            _, ext = os.path.splitext(rel_path)
+                            lang = ext[1:].lower() if ext else ""
+                            file_header = f"\n`{rel_path}`\n```{lang}\n"
+                            file_footer = "\n```\n"
                     
-                    # Calculate tokens for header and footer
-                    header_footer_tokens = calculate_tokens(file_header + file_footer)
-                    total_file_tokens = file_tokens + header_footer_tokens
+                            # Calculate tokens for header and footer
+                            header_footer_tokens = calculate_tokens(file_header + file_footer)
+                            total_file_tokens = file_tokens + header_footer_tokens
                     
-                    # Check if file fits in current chunk
-                    # If current chunk has content and adding this file would exceed limit, start new chunk
-                    if current_chunk_tokens > 0 and (current_chunk_tokens + total_file_tokens) > max_chunk_tokens:
-                        # Close current chunk
-                        out.close()
-                        self.result_chunk_tokens.append(current_chunk_tokens)
-                        print(f"[AGG_WORKER] 📦 Chunk {len(self.result_chunk_tokens)} completed with {current_chunk_tokens:,} tokens")
+                            # Check if file fits in current chunk
+                            # If current chunk has content and adding this file would exceed limit, start new chunk
+                            if current_chunk_tokens > 0 and (current_chunk_tokens + total_file_tokens) > max_chunk_tokens:
+                                # Close current chunk
+                                out.close()
+                                self.result_chunk_tokens.append(current_chunk_tokens)
+                                print(f"[AGG_WORKER] 📦 Chunk {len(self.result_chunk_tokens)} completed with {current_chunk_tokens:,} tokens")
                         
-                        # Start new chunk
-                        fd2, temp_path2 = tempfile.mkstemp(suffix=".agg.txt")
-                        os.close(fd2)
-                        self.result_file_paths.append(temp_path2)
-                        out = open(temp_path2, "w", encoding="utf-8", errors="replace")
-                        current_chunk_tokens = write_header(out)
-                        print(f"[AGG_WORKER] 📦 Started chunk {len(self.result_file_paths)} with header ({current_chunk_tokens:,} tokens)")
+                                # Start new chunk
+                                fd2, temp_path2 = tempfile.mkstemp(suffix=".agg.txt")
+                                os.close(fd2)
+                                self.result_file_paths.append(temp_path2)
+                                out = open(temp_path2, "w", encoding="utf-8", errors="replace")
+                                current_chunk_tokens = write_header(out)
+                                print(f"[AGG_WORKER] 📦 Started chunk {len(self.result_file_paths)} with header ({current_chunk_tokens:,} tokens)")
                     
                     
-                    # Write entire file to current chunk (never split mid-file)
-                    print(f"[AGG_WORKER] 📝 Writing file: {rel_path} ({len(file_content):,} chars)")
-                    print(f"[AGG_WORKER] 📝 First 80 chars: {file_content[:80]}")
-                    print(f"[AGG_WORKER] 📝 Last 80 chars: {file_content[-80:]}")
+                            # Write entire file to current chunk (never split mid-file)
+                            print(f"[AGG_WORKER] 📝 Writing file: {rel_path} ({len(file_content):,} chars)")
+                            print(f"[AGG_WORKER] 📝 First 80 chars: {file_content[:80]}")
+                            print(f"[AGG_WORKER] 📝 Last 80 chars: {file_content[-80:]}")
                     
-                    out.write(file_header)
-                    out.write(file_content)
-                    out.write(file_footer)
+                            out.write(file_header)
+                            out.write(file_content)
+                            out.write(file_footer)
                     
-                    # Verify write by checking file position
-                    current_pos = out.tell()
-                    print(f"[AGG_WORKER] ✅ Written, file position now: {current_pos:,}")
+                            # Verify write by checking file position
+                            current_pos = out.tell()
+                            print(f"[AGG_WORKER] ✅ Written, file position now: {current_pos:,}")
                     
-                    # Update token counts
-                    current_chunk_tokens += total_file_tokens
-                    total_tokens += total_file_tokens
-                    files_processed += 1
+                            # Update token counts
+                            current_chunk_tokens += total_file_tokens
+                            total_tokens += total_file_tokens
+                            files_processed += 1
                     
-                except Exception as e:
-                    print(f"[AGG_WORKER] ⚠️ Error processing {rel_path}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    continue
+                        except Exception as e:
+                            print(f"[AGG_WORKER] ⚠️ Error processing {rel_path}: {e}")
+                            import traceback
+                            traceback.print_exc()
+                            continue
 
             agg_loop_time = (time.time() - agg_loop_start) * 1000
             print(f"[AGG_WORKER] 🔄 Aggregation loop processed {files_processed} files in {agg_loop_time:.2f}ms")
@@ -429,12 +449,17 @@ class MainWindow(QMainWindow):
         print(f"[WINDOW] 🚀 Creating Model/View TreePanel for high performance...")
         self.tree_panel = create_tree_panel(use_model_view=True, parent=self)
         print(f"[WINDOW] ✅ Model/View TreePanel created successfully")
+        # Coalesces bursts of check toggles (shift-click, group restore) into one
+        # dirty-mark + token/aggregation update; restarting the timer extends the burst
+        self._selection_update_timer = QTimer(self)
+        self._selection_update_timer.setSingleShot(True)
+        self._selection_update_timer.setInterval(50)
+        self._selection_update_timer.timeout.connect(self._on_checkbox_changed)
         # Connect signals (Model/View TreePanel uses same interface)
         if hasattr(self.tree_panel, 'item_checked_changed'):
             self.tree_panel.item_checked_changed.connect(self._on_tree_selection_changed)
-            self.tree_panel.item_checked_changed.connect(self.update_aggregation_and_tokens)
-            # Connect to selection manager dirty tracking for old TreePanel
-            self.tree_panel.item_checked_changed.connect(self._on_checkbox_changed)
+            # Dirty tracking and aggregation run once per burst (_on_checkbox_changed updates both)
+            self.tree_panel.item_checked_changed.connect(self._selection_update_timer.start)
         else:
             # Model/View uses selection_changed signal
             self.tree_panel.selection_changed.connect(self._on_tree_selection_changed)
@@ -443,6 +468,8 @@ class MainWindow(QMainWindow):
             if hasattr(self.tree_panel, 'file_tree_view') and hasattr(self.tree_panel.file_tree_view, 'model'):
                 self.tree_panel.file_tree_view.model.dataChanged.connect(self._on_model_data_changed)
                 self.tree_panel.file_tree_view.model.layoutChanged.connect(self._on_model_layout_changed)
+        # Watcher batches report their token changes once per batch, not per file
+        self.tree_panel.file_tokens_changed_batch.connect(self._on_file_tokens_changed_batch)
         self.left_splitter.addWidget(self.selection_manager_panel)
         self.left_splitter.addWidget(self.tree_panel)
         self.left_splitter.setStretchFactor(0, 0)
@@ -485,7 +512,8 @@ class MainWindow(QMainWindow):
         # Top controls
         self.manage_workspaces_button.clicked.connect(self.workspace_ctl.open_manager)
         self.select_folder_button.clicked.connect(self.scan_ctl.select_folder)
-        self.scan_ctl.folder_selected.connect(self._update_path_display)
+        # Queued: the label updates from the scan config dialog's event loop instead of delaying its opening
+        self.scan_ctl.folder_selected.connect(self._update_path_display, Qt.ConnectionType.QueuedConnection)
         self.refresh_button.clicked.connect(self.scan_ctl.refresh)
 
         # Connect new workspace signals
@@ -512,6 +540,7 @@ class MainWindow(QMainWindow):
         self.selection_manager_panel.edit_requested.connect(self.sel_ctl.edit_group)
         self.selection_manager_panel.delete_requested.connect(self.sel_ctl.delete_group)
 
+    @Slot(int, int)
     def _on_scan_progress(self, completed: int, total: int):
         """Handle scan progress updates from streamlined scanner."""
         if total > 0:
@@ -519,6 +548,7 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage(f"Tokenizing files: {completed}/{total} ({progress_percent:.1f}%)")
             print(f"[STREAMLINED] 📊 Progress: {completed}/{total} ({progress_percent:.1f}%)")
     
+    @Slot(list)
     def _on_scan_complete(self, items: list):
         """Handle scan completion from streamlined scanner."""
         import time
@@ -560,6 +590,7 @@ class MainWindow(QMainWindow):
         total_time = (time.time() - start_time) * 1000
         print(f"[MAIN_WINDOW] ✅ _on_scan_complete finished in {total_time:.2f}ms")
     
+    @Slot(str)
     def _on_scan_error(self, error: str):
         """Handle scan errors from streamlined scanner."""
         print(f"[STREAMLINED] ❌ Scan error: {error}")
@@ -634,6 +665,8 @@ class MainWindow(QMainWindow):
                 self._update_current_workspace_state()
                 self._save_current_workspace_state()
                 print(f"[WORKSPACE_SWITCH] ✅ Current workspace state saved")
+                # Memoized group paths belong to the outgoing workspace root
+                selection_manager.clear_path_cache()
             
             # Phase 2: Workspace Data Validation (use cleaned name)
             if not self._validate_workspace_exists(clean_workspace_name):
@@ -1086,6 +1119,9 @@ class MainWindow(QMainWindow):
         """Handle the window close event by ensuring graceful shutdown and saving workspace state."""
         print(f"[WINDOW] 🚪 Application closing, saving workspace state...")
         
+        # The synchronous save below supersedes any pending debounced save
+        self._save_debounce_timer.stop()
+        
         # Save current workspace state before closing
         if self.current_workspace_name:
             print(f"[WINDOW] 💾 Saving workspace: {self.current_workspace_name}")
@@ -1223,9 +1259,10 @@ class MainWindow(QMainWindow):
                 
                 # Start background save
                 if hasattr(self, '_save_worker') and self._save_worker and self._save_worker.isRunning():
-                    # If a save is already running, we should probably wait or queue it
-                    # For now, let's just log it and skip to avoid race conditions
-                    print(f"[TREE] ⏳ Save already in progress, skipping intermediate save")
+                    # Don't race the running save; retry once it has had time to finish
+                    # so the latest state is not lost
+                    print(f"[TREE] ⏳ Save already in progress, rescheduling")
+                    self._save_debounce_timer.start()
                     return
 
                 self._save_worker = SaveWorker(self.workspaces, self.testing_path)
@@ -1255,7 +1292,7 @@ class MainWindow(QMainWindow):
         self.selection_manager_panel.set_dirty(True)
         print(f"[SELECTION] 🔄 Checkbox changed - selection manager marked as dirty")
 
-    @Slot()
+    @Slot(QModelIndex, QModelIndex, list)
     def _on_model_data_changed(self, top_left, bottom_right, roles):
         """Handle model data changes, specifically checkbox state changes."""
         from PySide6.QtCore import Qt
@@ -1275,6 +1312,12 @@ class MainWindow(QMainWindow):
         # Ensure aggregation reflects latest selection
         self.update_aggregation_and_tokens()
 
+    @Slot(dict)
+    def _on_file_tokens_changed_batch(self, token_deltas):
+        """Refresh the token count and aggregation once for a whole watcher batch."""
+        if token_deltas:
+            self.update_aggregation_and_tokens()
+
     @Slot()
     def _on_instructions_changed(self):
         """Handle instruction changes and update aggregation view."""
@@ -1284,11 +1327,10 @@ class MainWindow(QMainWindow):
             # Update the aggregation view with new instructions
             self.update_aggregation_and_tokens()
             
-            # Save workspace state to persist instruction changes
+            # Persist instruction changes through the debounced background save:
+            # this runs per keystroke, so a burst of typing becomes one write
             if self.current_workspace_name and self.workspaces:
-                self._update_current_workspace_state()
-                self._save_current_workspace_state()
-                print(f"[INSTRUCTIONS] ✅ Workspace state saved after instruction change")
+                self._save_debounce_timer.start()
                 
         except Exception as e:
             print(f"[INSTRUCTIONS] ❌ Error handling instruction change: {e}")
@@ -1322,6 +1364,7 @@ class MainWindow(QMainWindow):
 
         self._aggregation_timer.start()
 
+    @Slot()
     def _perform_background_aggregation(self):
         """Called by timer. Starts the background thread."""
         if not self.current_folder_path:
@@ -1770,7 +1813,7 @@ class MainWindow(QMainWindow):
             import traceback
             traceback.print_exc()
     
-    @Slot()
+    @Slot(QModelIndex, QModelIndex, list)
     def _on_model_data_changed(self, top_left, bottom_right, roles):
         """Handle model data changes, specifically checkbox state changes."""
         from PySide6.QtCore import Qt
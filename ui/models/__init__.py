@@ -3,6 +3,6 @@ UI Models package for ContextM.
 Contains high-performance data models for Qt Model/View architecture.
 """
 
-from .file_tree_model import FileTreeModel, TreeNode
+from .file_tree_model import FileTreeModel, TreeNode, TreeItemProxy, TreeItemsView
 
-__all__ = ['FileTreeModel', 'TreeNode']
+__all__ = ['FileTreeModel', 'TreeNode', 'TreeItemProxy', 'TreeItemsView']
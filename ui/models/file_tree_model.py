@@ -4,15 +4,31 @@ Replaces QTreeWidget for scalable performance with large file trees.
 """
 
 import os
-import pathlib
+import stat
+import sys
+from collections.abc import Mapping
 from typing import Dict, List, Optional, Any, Tuple, Set
 from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt, QObject
 from PySide6.QtGui import QIcon
 
-from core.helpers import calculate_tokens
+from core.file_reader import read_many_for_tokens
+from core.helpers import calculate_tokens_batch
+
+
+def _parent_dir(path: str) -> str:
+    """Parent of a '/'-normalized path; filesystem roots keep their slash ('/', 'C:/')."""
+    parent = path.rpartition('/')[0]
+    return parent if '/' in parent else parent + '/'
 
 
 class TreeNode:
+    # Slots keep per-node memory small and attribute access fast for large trees
+    __slots__ = (
+        'path', 'is_dir', 'parent', 'children', 'check_state', 'token_count',
+        'file_size', 'total_tokens', 'selected_tokens', 'is_valid', 'reason',
+        'name', '_row', 'fetched_count', 'checked_children', 'partial_children',
+    )
+
     def __init__(self, path, is_dir=False, parent=None):
         self.path = path
         self.is_dir = is_dir
@@ -20,13 +36,25 @@ class TreeNode:
         self.children = []  # Always use list for consistency
         self.check_state = Qt.CheckState.Unchecked
         self.token_count = 0
+        self.file_size = 0
+        self.total_tokens = 0  # Aggregated tokens of all files below a directory
+        self.selected_tokens = 0  # Aggregated tokens of checked files below a directory
         self.is_valid = True
         self.reason = ""
-        self.name = os.path.basename(path) if path else ""
+        # Paths are stored with '/' separators; names like __init__.py repeat across
+        # folders, so interning shares one string object between all such nodes
+        self.name = sys.intern(path[path.rfind('/') + 1:]) if path else ""
+        self._row = 0
+        self.fetched_count = 0  # Children exposed to views beyond the first fetch batch
+        # Children currently Checked / PartiallyChecked, kept in step by
+        # FileTreeModel._set_check_state so folder states never rescan siblings
+        self.checked_children = 0
+        self.partial_children = 0
         
     def add_child(self, child):
         """Add a child node."""
         child.parent = self
+        child._row = len(self.children)
         self.children.append(child)
         
     @property
@@ -44,7 +72,11 @@ class TreeNode:
     def row(self):
         """Get the row index of this node in its parent's children list."""
         if self.parent:
-            return self.parent.children.index(self)
+            siblings = self.parent.children
+            # Cached row is exact unless siblings were removed since add_child()
+            if self._row >= len(siblings) or siblings[self._row] is not self:
+                self._row = siblings.index(self)
+            return self._row
         return 0
         
     def child_count(self):
@@ -58,12 +90,81 @@ class TreeNode:
         return None
 
 
+class TreeItemProxy:
+    """
+    Lightweight QTreeWidgetItem-style handle onto a model node.
+    Lets code written against the old QTreeWidget TreePanel keep calling
+    text()/checkState()/setCheckState() while all state lives in the model.
+    """
+
+    __slots__ = ('_model', '_node')
+
+    def __init__(self, model: 'FileTreeModel', node: TreeNode):
+        self._model = model
+        self._node = node
+
+    def __eq__(self, other):
+        return isinstance(other, TreeItemProxy) and other._node is self._node
+
+    def __hash__(self):
+        return id(self._node)
+
+    def text(self, column: int) -> str:
+        index = self._model.index_for_node(self._node, column)
+        return self._model.data(index, Qt.ItemDataRole.DisplayRole) or ""
+
+    def data(self, column: int, role: int) -> Any:
+        return self._model.data(self._model.index_for_node(self._node, column), role)
+
+    def checkState(self, column: int = 0) -> Qt.CheckState:
+        return self._node.check_state
+
+    def setCheckState(self, column: int, state: Qt.CheckState) -> None:
+        index = self._model.index_for_node(self._node, column)
+        self._model.setData(index, state, Qt.ItemDataRole.CheckStateRole)
+
+    def childCount(self) -> int:
+        return len(self._node.children)
+
+    def child(self, index: int) -> Optional['TreeItemProxy']:
+        node = self._node.child_at(index)
+        return TreeItemProxy(self._model, node) if node else None
+
+    def parent(self) -> Optional['TreeItemProxy']:
+        parent = self._node.parent
+        if parent is None or parent is self._model.root_node:
+            return None
+        return TreeItemProxy(self._model, parent)
+
+
+class TreeItemsView(Mapping):
+    """Read-only ``path -> TreeItemProxy`` view over ``FileTreeModel.path_to_node``."""
+
+    def __init__(self, model: 'FileTreeModel'):
+        self._model = model
+
+    def __getitem__(self, path: str) -> TreeItemProxy:
+        return TreeItemProxy(self._model, self._model.path_to_node[path])
+
+    def __contains__(self, path) -> bool:
+        return path in self._model.path_to_node
+
+    def __iter__(self):
+        return iter(self._model.path_to_node)
+
+    def __len__(self) -> int:
+        return len(self._model.path_to_node)
+
+
 class FileTreeModel(QAbstractItemModel):
     """
     High-performance tree model for file/directory display.
     Uses lightweight TreeNode objects instead of heavyweight QTreeWidgetItems.
     """
     
+    # Very large folders expose their children to views in batches of this size
+    FETCH_BATCH_SIZE = 500
+
     # Custom roles for data access
     PathRole = Qt.ItemDataRole.UserRole + 1
     IsDirRole = Qt.ItemDataRole.UserRole + 2
@@ -78,6 +179,7 @@ class FileTreeModel(QAbstractItemModel):
         self.root_node = TreeNode("", True)  # Invisible root
         self.path_to_node: Dict[str, TreeNode] = {}
         self._checked_files = set()  # Cache of checked file paths for fast aggregation
+        self._checked_empty_dirs = set()  # Childless folders left checked by propagation
         self.view = view  # Reference to the view for checking ignore flag
         self.root_path = ""
         
@@ -87,6 +189,7 @@ class FileTreeModel(QAbstractItemModel):
         self.root_node = TreeNode("", True)
         self.path_to_node.clear()
         self._checked_files.clear()  # CRITICAL: Clear cached checked files
+        self._checked_empty_dirs.clear()
         self.root_path = ""
         self.endResetModel()
         
@@ -106,6 +209,7 @@ class FileTreeModel(QAbstractItemModel):
         self.root_node = TreeNode("", True)
         self.path_to_node.clear()
         self._checked_files.clear()  # CRITICAL: Clear cached checked files to ensure clean state
+        self._checked_empty_dirs.clear()
         self.root_path = os.path.normpath(root_path).replace('\\', '/')
         
         # Create root project node (starts unchecked by default)
@@ -113,24 +217,52 @@ class FileTreeModel(QAbstractItemModel):
         self.root_node.add_child(project_node)
         self.path_to_node[self.root_path] = project_node
         
-        # Sort items: directories first, then files
-        sorted_items = sorted(items, key=lambda x: (not x[1], x[0]))  # dirs first, then by path
-        
-        # Create all directory nodes first (all start unchecked by default)
-        for path_str, is_dir, rel_path, file_size, tokens in sorted_items:
-            if is_dir:
-                norm_path = os.path.normpath(path_str).replace('\\', '/')
-                self._ensure_directory_path(norm_path)
-        
-        # Then add all files (all start unchecked by default)
-        for path_str, is_dir, rel_path, file_size, tokens in sorted_items:
+        # Normalize once and sort into depth-first order (directories before files
+        # within each folder) so every parent is created before its children
+        entries = []
+        for path_str, is_dir, rel_path, file_size, tokens in items:
+            norm_path = os.path.normpath(path_str).replace('\\', '/')
+            parts = norm_path.split('/')
+            sort_key = tuple((0, part) for part in parts[:-1]) + ((0 if is_dir else 1, parts[-1]),)
+            entries.append((sort_key, norm_path, is_dir, file_size, tokens))
+        entries.sort(key=lambda entry: entry[0])
+
+        # Stream nodes in, keeping the current ancestor chain on a stack instead of
+        # resolving every parent through path lookups (all start unchecked by default)
+        ancestors = [project_node]
+        for _, norm_path, is_dir, file_size, tokens in entries:
+            existing = self.path_to_node.get(norm_path)
+            if existing is not None:
+                if existing.is_dir:
+                    ancestors = [existing]
+                continue
+
+            parent_path = _parent_dir(norm_path)
+            while ancestors and ancestors[-1].path != parent_path:
+                ancestors.pop()
+            if ancestors:
+                parent_node = ancestors[-1]
+            else:
+                # Parent folder was not part of the scan results; create the chain
+                parent_node = self._ensure_directory_path(parent_path)
+                ancestors = [parent_node]
+
+            node = TreeNode(norm_path, is_dir, parent_node)
             if not is_dir:
-                norm_path = os.path.normpath(path_str).replace('\\', '/')
-                self._add_file_node(norm_path, file_size, tokens)
+                node.file_size = file_size
+                node.token_count = tokens
+            parent_node.add_child(node)
+            self.path_to_node[norm_path] = node
+
+            if is_dir:
+                ancestors.append(node)
         
         # Apply pending paths to restore after population (if provided)
         if pending_restore_paths:
             self._restore_checked_paths(pending_restore_paths)
+
+        # Fill folder token sums once; check toggles then only apply deltas
+        self._recompute_token_totals()
         
         self.endResetModel()
         
@@ -140,8 +272,8 @@ class FileTreeModel(QAbstractItemModel):
             return self.path_to_node[dir_path]
             
         # Ensure parent directory exists first
-        parent_path = os.path.dirname(dir_path)
-        if parent_path and parent_path != dir_path:
+        parent_path = _parent_dir(dir_path)
+        if parent_path != dir_path:
             parent_node = self._ensure_directory_path(parent_path)
         else:
             parent_node = self.path_to_node[self.root_path]
@@ -155,8 +287,7 @@ class FileTreeModel(QAbstractItemModel):
         
     def _add_file_node(self, file_path: str, file_size: int, tokens: int) -> None:
         """Add a file node to the appropriate parent directory."""
-        parent_path = os.path.dirname(file_path)
-        parent_node = self._ensure_directory_path(parent_path)
+        parent_node = self._ensure_directory_path(_parent_dir(file_path))
         
         # Create file node
         file_node = TreeNode(file_path, False, parent_node)
@@ -178,11 +309,12 @@ class FileTreeModel(QAbstractItemModel):
 
         # Remove this node from the path index and checked-files cache
         path = node.path
-        if path in self.path_to_node:
-            self.path_to_node.pop(path, None)
+        self.path_to_node.pop(path, None)
 
         if not node.is_dir and path:
             self._checked_files.discard(path)
+        elif path:
+            self._checked_empty_dirs.discard(path)
         
     def _restore_checked_paths(self, pending_restore_paths: Set[str]) -> None:
         """Restore checked state for pending paths after tree population.
@@ -206,7 +338,7 @@ class FileTreeModel(QAbstractItemModel):
                 node = self.path_to_node[norm_path]
                 # Only restore checked state for files, not directories
                 if not node.is_dir:
-                    node.check_state = Qt.CheckState.Checked
+                    self._set_check_state(node, Qt.CheckState.Checked)
                     # Update cached checked files set
                     self._checked_files.add(norm_path)
                     nodes_to_update_parents_for.append(node)
@@ -218,6 +350,16 @@ class FileTreeModel(QAbstractItemModel):
                 self._update_parent_states(parent_node)
         
     # QAbstractItemModel interface implementation
+
+    def index_for_node(self, node: Optional[TreeNode], column: int = 0) -> QModelIndex:
+        """Get the model index for a node (invalid index for the invisible root).
+
+        Also used for rows views have not fetched yet; change signals for those
+        are skipped through _is_exposed().
+        """
+        if node is None or node is self.root_node:
+            return QModelIndex()
+        return self.createIndex(node.row(), column, node)
     
     def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
         """Create model index for given row/column/parent."""
@@ -258,7 +400,36 @@ class FileTreeModel(QAbstractItemModel):
         else:
             parent_node = parent.internalPointer()
             
-        return parent_node.child_count()
+        return self._visible_child_count(parent_node)
+
+    def _visible_child_count(self, node: TreeNode) -> int:
+        """Number of children currently exposed to views (see fetchMore)."""
+        return min(len(node.children), max(node.fetched_count, self.FETCH_BATCH_SIZE))
+
+    def _is_exposed(self, node: TreeNode) -> bool:
+        """Whether views have been shown node's row and the rows of all its ancestors."""
+        while node is not self.root_node:
+            parent = node.parent
+            if parent is None or node.row() >= self._visible_child_count(parent):
+                return False
+            node = parent
+        return True
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        """Whether a folder still has children that views have not been shown yet."""
+        node = parent.internalPointer() if parent.isValid() else self.root_node
+        return len(node.children) > self._visible_child_count(node)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """Expose the next batch of children of a very large folder to views."""
+        node = parent.internalPointer() if parent.isValid() else self.root_node
+        visible = self._visible_child_count(node)
+        new_visible = min(len(node.children), visible + self.FETCH_BATCH_SIZE)
+        if new_visible <= visible:
+            return
+        self.beginInsertRows(parent, visible, new_visible - 1)
+        node.fetched_count = new_visible
+        self.endInsertRows()
         
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """Get number of columns."""
@@ -277,9 +448,10 @@ class FileTreeModel(QAbstractItemModel):
                 return node.name
             elif column == 1:
                 if node.is_dir:
-                    # Calculate total tokens for directory
-                    total_tokens = self._calculate_directory_tokens(node)
-                    return f"{total_tokens:,} tokens" if total_tokens > 0 else ""
+                    # Folder sums are maintained incrementally, no subtree walk here
+                    if node.total_tokens > 0:
+                        return f"{node.selected_tokens:,} / {node.total_tokens:,} tokens"
+                    return ""
                 else:
                     return f"{node.token_count:,} tokens" if node.token_count > 0 else ""
                     
@@ -318,9 +490,11 @@ class FileTreeModel(QAbstractItemModel):
             # Only proceed if state actually changed
             if node.check_state == check_state:
                 return True
+
+            old_selected_tokens = node.selected_tokens
                 
             # Set the new state
-            node.check_state = check_state
+            self._set_check_state(node, check_state)
             
             # Debug logging for directories
             if node.is_dir:
@@ -336,8 +510,9 @@ class FileTreeModel(QAbstractItemModel):
             # Debug logging disabled for performance
             # print(f"[CHECKBOX_DEBUG] {node.path}: {check_state.name}")
             
-            # Emit data changed for this node
-            self.dataChanged.emit(index, index, [role])
+            # Emit data changed for this node (rows not fetched yet are not known to views)
+            if self._is_exposed(node):
+                self.dataChanged.emit(index, index, [role])
 
             # Propagate changes to children if this is a directory
             if node.is_dir and check_state != Qt.CheckState.PartiallyChecked:
@@ -346,6 +521,17 @@ class FileTreeModel(QAbstractItemModel):
                 self._propagate_to_children(node, check_state)
                 cache_size = len(self._checked_files)
                 print(f"[CHECKBOX] ✅ After propagation, _checked_files cache has {cache_size} entries")
+
+            # Roll the selected-token change up the ancestors (O(depth))
+            if node.is_dir:
+                self._recompute_token_totals(node)
+                # The folder's own "selected / total" label lives in column 1
+                if self._is_exposed(node):
+                    token_index = self.createIndex(node.row(), 1, node)
+                    self.dataChanged.emit(token_index, token_index, [Qt.ItemDataRole.DisplayRole])
+            else:
+                node.selected_tokens = node.token_count if check_state == Qt.CheckState.Checked else 0
+            self._propagate_token_delta(node, selected_delta=node.selected_tokens - old_selected_tokens)
                 
             # Update parent states recursively
             self._update_parent_states(node.parent)
@@ -369,59 +555,47 @@ class FileTreeModel(QAbstractItemModel):
         return flags
 
     def _propagate_to_children(self, parent_node: 'TreeNode', check_state: Qt.CheckState):
-        """Recursively set the check state for all children using optimized bulk strategy."""
-        # Collect all nodes that need updating first (bulk strategy)
-        nodes_to_update = []
-        self._collect_children_for_update(parent_node, check_state, nodes_to_update)
-        
-        if not nodes_to_update:
-            return
-        
-        # Block signals during bulk state updates to prevent individual emissions
-        self.blockSignals(True)
-        
-        try:
-            # Update all node states in memory first (no signals yet)
-            for node in nodes_to_update:
-                node.check_state = check_state
-                
-                # Update cached checked files set for fast aggregation
-                if not node.is_dir:
-                    if check_state == Qt.CheckState.Checked:
-                        self._checked_files.add(node.path)
-                    else:
-                        self._checked_files.discard(node.path)
-        finally:
-            # Unblock signals
-            self.blockSignals(False)
-        
-        # Emit single dataChanged signal for the entire range to maintain performance
-        # This tells the view that checkboxes have changed without individual signals
-        if nodes_to_update:
-            # Find the parent's index to emit a range-based signal
-            try:
-                parent_index = self.createIndex(parent_node.row(), 0, parent_node)
-                if parent_index.isValid():
-                    # Emit dataChanged for the parent and let the view handle the refresh
-                    self.dataChanged.emit(parent_index, parent_index, [Qt.ItemDataRole.CheckStateRole])
-                    # Also emit layoutChanged to ensure all child checkboxes update
-                    self.layoutChanged.emit()
-            except (ValueError, IndexError):
-                # Fallback: just emit layoutChanged
-                self.layoutChanged.emit()
-            
-    def _collect_children_for_update(self, parent_node: 'TreeNode', check_state: Qt.CheckState, nodes_to_update: list):
-        """Recursively collect all children that need state updates."""
-        for child in parent_node.children:
-            if child.check_state != check_state:
-                nodes_to_update.append(child)
+        """Set the check state for a whole subtree with one iterative sweep.
+
+        Each folder whose children changed gets a single dataChanged over its
+        visible child rows instead of a full layoutChanged.
+        """
+        changed_folders = []
+        stack = [parent_node]
+        while stack:
+            folder = stack.pop()
+            folder_changed = False
+            for child in folder.children:
+                # A child already in the target state has a consistent subtree
+                if child.check_state == check_state:
+                    continue
+                self._set_check_state(child, check_state)
+                folder_changed = True
+
                 if child.is_dir:
-                    self._collect_children_for_update(child, check_state, nodes_to_update)
+                    stack.append(child)
+                # Update cached checked files set for fast aggregation
+                elif check_state == Qt.CheckState.Checked:
+                    self._checked_files.add(child.path)
+                else:
+                    self._checked_files.discard(child.path)
+
+            if folder_changed:
+                changed_folders.append(folder)
+
+        # One contiguous row range per folder so the view repaints only those rows
+        for folder in changed_folders:
+            visible = self._visible_child_count(folder)
+            if visible and self._is_exposed(folder):
+                first = self.createIndex(0, 0, folder.children[0])
+                # Column 1 too: subfolders' "selected / total" labels changed with them
+                last = self.createIndex(visible - 1, 1, folder.children[visible - 1])
+                self.dataChanged.emit(
+                    first, last, [Qt.ItemDataRole.CheckStateRole, Qt.ItemDataRole.DisplayRole]
+                )
 
     def _update_parent_states(self, node: 'TreeNode'):
-        """Recursively update the check state of parent nodes using bulk strategy."""
-        # Collect all parents that need updating
-        parents_to_update = []
+        """Update the check state of ancestors, stopping once a state is unchanged."""
         current_node = node
         
         while current_node:
@@ -433,62 +607,57 @@ class FileTreeModel(QAbstractItemModel):
             # Calculate new state based on children
             new_state = self._calculate_parent_state(current_node)
             
-            # Only update if state actually changed
-            if current_node.check_state != new_state:
-                current_node.check_state = new_state
-                parents_to_update.append(current_node)
+            # An unchanged folder cannot change anything further up
+            if current_node.check_state == new_state:
+                break
+            self._set_check_state(current_node, new_state)
+
+            if current_node is not self.root_node and self._is_exposed(current_node):
+                parent_index = self.createIndex(current_node.row(), 0, current_node)
+                self.dataChanged.emit(parent_index, parent_index, [Qt.ItemDataRole.CheckStateRole])
             
             current_node = current_node.parent
             
-        # Emit efficient signals for parent updates to ensure UI sync
-        if parents_to_update:
-            # Block signals during bulk parent updates
-            self.blockSignals(True)
-            try:
-                pass  # States already updated above
-            finally:
-                self.blockSignals(False)
-            
-            # Emit single dataChanged signal for all parents at once
-            # This is much more efficient than individual signals
-            if len(parents_to_update) == 1:
-                # Single parent - emit specific signal
-                parent = parents_to_update[0]
-                try:
-                    parent_index = self.createIndex(parent.row(), 0, parent)
-                    if parent_index.isValid():
-                        self.dataChanged.emit(parent_index, parent_index, [Qt.ItemDataRole.CheckStateRole])
-                except (ValueError, IndexError):
-                    self.layoutChanged.emit()
-            else:
-                # Multiple parents - emit layoutChanged for efficiency
-                self.layoutChanged.emit()
-            
     def _calculate_parent_state(self, parent_node: 'TreeNode') -> Qt.CheckState:
-        """Calculate the appropriate check state for a parent based on its children."""
-        if not parent_node.children:
+        """Calculate the appropriate check state for a parent from its child counters (O(1))."""
+        child_count = len(parent_node.children)
+        if not child_count:
             return parent_node.check_state
-            
-        child_states = [child.check_state for child in parent_node.children]
-        
-        # Count different states
-        checked_count = child_states.count(Qt.CheckState.Checked)
-        unchecked_count = child_states.count(Qt.CheckState.Unchecked)
-        partial_count = child_states.count(Qt.CheckState.PartiallyChecked)
-        
-        # Determine parent state based on children
-        if partial_count > 0:
+
+        if parent_node.partial_children:
             # Any partially checked child means parent is partially checked
             return Qt.CheckState.PartiallyChecked
-        elif checked_count > 0 and unchecked_count > 0:
-            # Mixed checked/unchecked children means partially checked
-            return Qt.CheckState.PartiallyChecked
-        elif checked_count > 0 and unchecked_count == 0:
+        if parent_node.checked_children == child_count:
             # All children checked means parent is checked
             return Qt.CheckState.Checked
-        else:
+        if parent_node.checked_children == 0:
             # All children unchecked means parent is unchecked
             return Qt.CheckState.Unchecked
+        # Mixed checked/unchecked children means partially checked
+        return Qt.CheckState.PartiallyChecked
+
+    def _set_check_state(self, node: TreeNode, check_state: Qt.CheckState) -> None:
+        """Set a node's check state and keep its parent's child counters in step."""
+        old_state = node.check_state
+        if old_state == check_state:
+            return
+        node.check_state = check_state
+        if node.is_dir and not node.children:
+            if check_state == Qt.CheckState.Unchecked:
+                self._checked_empty_dirs.discard(node.path)
+            else:
+                self._checked_empty_dirs.add(node.path)
+        if node.parent is not None:
+            self._count_child_state(node.parent, old_state, -1)
+            self._count_child_state(node.parent, check_state, 1)
+
+    @staticmethod
+    def _count_child_state(parent: TreeNode, check_state: Qt.CheckState, delta: int) -> None:
+        """Adjust a folder's Checked/PartiallyChecked child counters by delta."""
+        if check_state == Qt.CheckState.Checked:
+            parent.checked_children += delta
+        elif check_state == Qt.CheckState.PartiallyChecked:
+            parent.partial_children += delta
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
         """Get header data."""
@@ -500,26 +669,96 @@ class FileTreeModel(QAbstractItemModel):
         return None
 
     def _calculate_directory_tokens(self, dir_node: TreeNode) -> int:
-        """Calculate total tokens for a directory (recursive)."""
-        total = 0
-        for child in dir_node.children:
-            if child.is_dir:
-                total += self._calculate_directory_tokens(child)
+        """Get total tokens for a directory (maintained incrementally)."""
+        return dir_node.total_tokens
+
+    def _recompute_token_totals(self, node: Optional[TreeNode] = None) -> None:
+        """Recompute total/selected token sums for a subtree in a single postorder pass.
+
+        Used after population and bulk selection changes; single toggles go
+        through _propagate_token_delta() instead.
+        """
+        stack = [(node or self.root_node, False)]
+        while stack:
+            current, children_done = stack.pop()
+            if not current.is_dir:
+                current.total_tokens = current.token_count
+                current.selected_tokens = current.token_count if current.check_state == Qt.CheckState.Checked else 0
+            elif children_done:
+                current.total_tokens = sum(child.total_tokens for child in current.children)
+                current.selected_tokens = sum(child.selected_tokens for child in current.children)
             else:
-                total += child.token_count
-        return total
+                stack.append((current, True))
+                stack.extend((child, False) for child in current.children)
+
+    def _propagate_token_delta(self, node: TreeNode, total_delta: int = 0, selected_delta: int = 0,
+                               notify: bool = True) -> None:
+        """Add token deltas to every ancestor directory of node (O(depth))."""
+        if not total_delta and not selected_delta:
+            return
+
+        parent = node.parent
+        while parent is not None:
+            parent.total_tokens += total_delta
+            parent.selected_tokens += selected_delta
+            if notify and parent is not self.root_node and self._is_exposed(parent):
+                token_index = self.createIndex(parent.row(), 1, parent)
+                self.dataChanged.emit(token_index, token_index, [Qt.ItemDataRole.DisplayRole])
+            parent = parent.parent
+
+    def set_file_token_count(self, node: TreeNode, token_count: int) -> None:
+        """Update a file's token count and roll the difference up to its folders."""
+        total_delta = token_count - node.token_count
+        if not total_delta:
+            return
+
+        node.token_count = token_count
+        node.total_tokens = token_count
+        selected_delta = total_delta if node.check_state == Qt.CheckState.Checked else 0
+        node.selected_tokens += selected_delta
+
+        if self._is_exposed(node):
+            token_index = self.createIndex(node.row(), 1, node)
+            self.dataChanged.emit(token_index, token_index, [Qt.ItemDataRole.DisplayRole])
+        self._propagate_token_delta(node, total_delta, selected_delta)
         
     def get_node_by_path(self, path: str) -> Optional[TreeNode]:
         """Get tree node by file path."""
         return self.path_to_node.get(path)
         
-    def get_checked_paths(self) -> List[str]:
+    def get_checked_paths(self, relative: bool = False) -> List[str]:
         """Get a list of all checked file paths, ignoring partially checked folders.
         
         OPTIMIZED: Returns the cached set of checked files directly (O(1)).
+        With relative=True, paths are built from node names below the project
+        root, reusing each folder's prefix for all of its checked descendants.
         """
-        # Return a list of the cached checked files
-        return list(self._checked_files)
+        if not relative:
+            # Return a list of the cached checked files
+            return list(self._checked_files)
+
+        project_node = self.path_to_node.get(self.root_path)
+        prefixes: Dict[TreeNode, str] = {}
+        relative_paths = []
+        for path in self._checked_files:
+            node = self.path_to_node.get(path)
+            if node is not None:
+                relative_paths.append(self._relative_prefix(node.parent, project_node, prefixes) + node.name)
+        return relative_paths
+
+    def _relative_prefix(self, folder: Optional[TreeNode], project_node: Optional[TreeNode],
+                         prefixes: Dict[TreeNode, str]) -> str:
+        """Get the 'a/b/' style prefix of a folder relative to the project root (memoized)."""
+        uncached = []
+        while folder is not None and folder is not project_node and folder not in prefixes:
+            uncached.append(folder)
+            folder = folder.parent
+
+        prefix = prefixes.get(folder, '')
+        for node in reversed(uncached):
+            prefix = f"{prefix}{node.name}{os.sep}"
+            prefixes[node] = prefix
+        return prefix
         
     def _collect_checked_file_paths(self, node: TreeNode, checked_paths: List[str]) -> None:
         """Recursively collect checked file paths (not directory paths).
@@ -542,16 +781,19 @@ class FileTreeModel(QAbstractItemModel):
         for child in node.children:
             self._collect_checked_paths(child, checked_paths)
 
-    def handle_fs_events(self, event_batch: List[Dict[str, Any]]) -> None:
+    def handle_fs_events(self, event_batch: List[Dict[str, Any]]) -> Dict[str, int]:
         """Apply a batch of filesystem events to the tree model.
 
         Events are dictionaries with at least:
             - action: 'created', 'deleted', 'moved', or 'modified'
             - src_path: original path
             - dst_path: new path (for 'moved')
+
+        Returns a {path: token_delta} dict for every path whose tokens changed.
         """
+        token_deltas: Dict[str, int] = {}
         if not event_batch:
-            return
+            return token_deltas
 
         # Notify views that the layout is about to change for incremental updates
         self.layoutAboutToBeChanged.emit()
@@ -559,40 +801,34 @@ class FileTreeModel(QAbstractItemModel):
         def _normalize(path: str) -> str:
             return os.path.normpath(path).replace('\\', '/') if path else ''
 
+        # New files are tokenized together after the loop in one batched encode
+        pending_token_nodes = []
+        # Folders that lost children; their check state is recomputed after the batch
+        shrunk_folders = []
+
         def _handle_created(path: str) -> None:
             norm_path = _normalize(path)
             if not norm_path or norm_path in self.path_to_node:
                 return
 
-            parent_path = os.path.dirname(norm_path)
-            if not parent_path:
-                parent_path = self.root_path or norm_path
-
-            parent_node = self._ensure_directory_path(parent_path)
-            is_dir = os.path.isdir(norm_path)
-
-            node = TreeNode(norm_path, is_dir, parent_node)
+            parent_node = self._ensure_directory_path(_parent_dir(norm_path))
 
-            # Best-effort initial metadata
+            # One stat call gives both the type and the size
             try:
-                node.file_size = os.path.getsize(norm_path) if not is_dir else 0
+                st = os.stat(norm_path)
             except OSError:
-                node.file_size = 0
+                st = None
+            is_dir = st is not None and stat.S_ISDIR(st.st_mode)
 
-            if not is_dir:
-                # Read file contents and calculate tokens; fall back to 0 on error
-                try:
-                    with open(norm_path, 'r', encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                    node.token_count = calculate_tokens(content)
-                except OSError:
-                    node.token_count = 0
-            else:
-                node.token_count = 0
+            node = TreeNode(norm_path, is_dir, parent_node)
+            node.file_size = st.st_size if st is not None and not is_dir else 0
 
             parent_node.add_child(node)
             self.path_to_node[norm_path] = node
 
+            if not is_dir:
+                pending_token_nodes.append(node)
+
         def _handle_deleted(path: str) -> None:
             norm_path = _normalize(path)
             if not norm_path:
@@ -602,14 +838,35 @@ class FileTreeModel(QAbstractItemModel):
             if not node:
                 return
 
+            # Take the node's tokens out of its ancestors' sums before detaching
+            self._propagate_token_delta(node, -node.total_tokens, -node.selected_tokens, notify=False)
+            if node.total_tokens:
+                token_deltas[norm_path] = token_deltas.get(norm_path, 0) - node.total_tokens
+
             # Detach from parent children list
             parent = node.parent
-            if parent and node in parent.children:
-                parent.children.remove(node)
+            if parent:
+                # row() is the cached position, so no scan of the siblings
+                parent.children.pop(node.row())
+                self._count_child_state(parent, node.check_state, -1)
 
             # Recursively remove from indices and caches
             self._remove_node_recursively(node)
 
+            # Folder events are not watched, so a folder emptied by this delete is
+            # pruned by walking up the parent links while it is gone from disk too
+            while (parent is not None and parent.parent is not self.root_node
+                   and parent.parent is not None and not parent.children
+                   and not os.path.isdir(parent.path)):
+                empty_folder, parent = parent, parent.parent
+                parent.children.pop(empty_folder.row())
+                self._count_child_state(parent, empty_folder.check_state, -1)
+                self.path_to_node.pop(empty_folder.path, None)
+                self._checked_empty_dirs.discard(empty_folder.path)
+
+            if parent is not None and parent is not self.root_node:
+                shrunk_folders.append(parent)
+
         for event in event_batch:
             action = event.get('action')
             src_path = event.get('src_path', '')
@@ -629,5 +886,44 @@ class FileTreeModel(QAbstractItemModel):
             # 'modified' events do not change the tree structure; token updates
             # (if any) can be handled separately by the background tokenizer.
 
+        # Skip files that a later event in this batch already removed again
+        pending_token_nodes = [node for node in pending_token_nodes
+                               if self.path_to_node.get(node.path) is node]
+        if pending_token_nodes:
+            token_counts = {}
+            nodes_to_encode = []
+            contents = []
+            # Large files get a size-based estimate; a file that vanished meanwhile counts as empty
+            reads = read_many_for_tokens([node.path for node in pending_token_nodes])
+            for node, (text, estimated_tokens) in zip(pending_token_nodes, reads):
+                if text is None:
+                    token_counts[node] = estimated_tokens
+                else:
+                    nodes_to_encode.append(node)
+                    contents.append(text)
+
+            token_counts.update(zip(nodes_to_encode, calculate_tokens_batch(contents)))
+
+            for node in pending_token_nodes:
+                token_count = token_counts[node]
+                node.token_count = token_count
+                # New nodes start unchecked, so only folder totals move
+                node.total_tokens = token_count
+                self._propagate_token_delta(node, total_delta=token_count, notify=False)
+                if token_count:
+                    token_deltas[node.path] = token_deltas.get(node.path, 0) + token_count
+
         # Notify views that layout has changed so they can refresh
         self.layoutChanged.emit()
+
+        # A removed checked/partial child only adjusted its parent's counters; the
+        # parent's own state (and its ancestors') follows from the remaining children
+        for folder in shrunk_folders:
+            if self.path_to_node.get(folder.path) is not folder:
+                continue  # Removed later in the same batch
+            if folder.children:
+                self._update_parent_states(folder)
+            elif folder.check_state != Qt.CheckState.Unchecked:
+                # Now an empty folder, tracked like one left checked by propagation
+                self._checked_empty_dirs.add(folder.path)
+        return token_deltas
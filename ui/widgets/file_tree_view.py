@@ -174,16 +174,19 @@ class FileTreeView(QWidget):
         # Store root path
         self.root_path = os.path.normpath(root_path).replace('\\', '/')
         
-        # Populate model directly (this is FAST!)
-        model_start = time.time()
-        self.model.populate_from_bg_scanner(items, root_path)
-        model_time = (time.time() - model_start) * 1000
-        print(f"[TREE_VIEW] 📊 Model population took {model_time:.2f}ms")
-        
-        # Expand root level
-        root_index = self.model.index(0, 0)  # First child of invisible root
-        if root_index.isValid():
-            self.tree_view.expand(root_index)
+        # Populate and expand with painting off so the view lays out only once
+        self.tree_view.setUpdatesEnabled(False)
+        try:
+            # Populate model directly (this is FAST!)
+            model_start = time.time()
+            self.model.populate_from_bg_scanner(items, root_path)
+            model_time = (time.time() - model_start) * 1000
+            print(f"[TREE_VIEW] 📊 Model population took {model_time:.2f}ms")
+            
+            # Expand root level in a single pass - deeper folders start collapsed
+            self.tree_view.expandToDepth(0)
+        finally:
+            self.tree_view.setUpdatesEnabled(True)
             
         # Emit signal
         self.root_path_changed.emit(self.root_path)
@@ -199,53 +202,90 @@ class FileTreeView(QWidget):
         return []
 
     def set_checked_paths(self, paths: Set[str]):
-        """Set the checked state for a given set of paths and update parent states."""
+        """Make exactly the given file paths checked and update parent states.
+
+        Only the difference to the current selection is applied, so switching
+        between similar selection groups touches just the changed files.
+        """
         from PySide6.QtCore import Qt
-        
-        # Clear the cached checked files set
-        self.model._checked_files.clear()
-        
-        # Reset all states first to ensure a clean slate
-        for node in self.model.path_to_node.values():
-            node.check_state = Qt.CheckState.Unchecked
+        model = self.model
 
-        # Set the specified file paths to checked
-        nodes_to_update_parents_for = []
+        # Resolve the requested paths to file nodes
+        target_nodes = {}
         for path in paths:
             node = None
             
             # First try direct match against stored paths
-            if path in self.model.path_to_node:
-                node = self.model.path_to_node[path]
+            if path in model.path_to_node:
+                node = model.path_to_node[path]
             else:
                 # CRITICAL FIX: try a normalized forward-slash variant
                 normalized_variant = path.replace('\\', '/')
-                if normalized_variant in self.model.path_to_node:
-                    node = self.model.path_to_node[normalized_variant]
+                if normalized_variant in model.path_to_node:
+                    node = model.path_to_node[normalized_variant]
                 # Fix #3: Case-Insensitive Path Matching for Windows
                 elif os.name == 'nt':  # Windows - try case-insensitive matching
                     normalized_path = os.path.normcase(normalized_variant)
-                    for stored_path, stored_node in self.model.path_to_node.items():
+                    for stored_path, stored_node in model.path_to_node.items():
                         if os.path.normcase(stored_path) == normalized_path:
                             node = stored_node
                             print(f"[SELECT] 🔍 Case-insensitive match: '{path}' -> '{stored_path}'")
                             break
             
             if node and not node.is_dir:
-                node.check_state = Qt.CheckState.Checked
-                # Update cached checked files set with original stored path
-                actual_path = node.path  # Use the actual stored path
-                self.model._checked_files.add(actual_path)
-                nodes_to_update_parents_for.append(node)
+                target_nodes[node.path] = node
+
+        # Diff against the cached checked files instead of resetting every node
+        to_uncheck = []
+        for path in list(model._checked_files):
+            if path in target_nodes:
+                continue
+            node = model.path_to_node.get(path)
+            if node is None:
+                model._checked_files.discard(path)
+            else:
+                to_uncheck.append(node)
+        to_check = [node for path, node in target_nodes.items() if path not in model._checked_files]
 
-        # Update all parent states from the bottom up, starting from the parents of the changed nodes
-        # This is more efficient than iterating through all paths again
-        unique_parents = {node.parent for node in nodes_to_update_parents_for if node.parent}
-        for parent_node in unique_parents:
-            self.model._update_parent_states(parent_node)
+        changed_parents = set()
+        # Folders without children are only checked by propagation from an ancestor;
+        # no file in the target set implies them, so they all end up unchecked
+        empty_folders = []
+        for path in list(model._checked_empty_dirs):
+            node = model.path_to_node.get(path)
+            if node is None or node.children:
+                # Removed, or gained children whose states now decide its own
+                model._checked_empty_dirs.discard(path)
+            else:
+                empty_folders.append(node)
+        for node in empty_folders:
+            model._set_check_state(node, Qt.CheckState.Unchecked)
+            if node.parent:
+                changed_parents.add(node.parent)
+
+        for nodes, state in ((to_uncheck, Qt.CheckState.Unchecked), (to_check, Qt.CheckState.Checked)):
+            for node in nodes:
+                model._set_check_state(node, state)
+                if state == Qt.CheckState.Checked:
+                    model._checked_files.add(node.path)
+                else:
+                    model._checked_files.discard(node.path)
+
+                # Roll the selected-token change up the ancestors (O(depth))
+                old_selected_tokens = node.selected_tokens
+                node.selected_tokens = node.token_count if state == Qt.CheckState.Checked else 0
+                model._propagate_token_delta(node, selected_delta=node.selected_tokens - old_selected_tokens,
+                                             notify=False)
+                if node.parent:
+                    changed_parents.add(node.parent)
+
+        # Update parent states from the bottom up, starting from the parents of the changed nodes
+        for parent_node in changed_parents:
+            model._update_parent_states(parent_node)
 
         # Emit a layout changed signal to refresh the entire view at once
-        self.model.layoutChanged.emit()
+        if to_check or to_uncheck or empty_folders:
+            model.layoutChanged.emit()
         
     def expand_to_depth(self, depth: int):
         """Expand tree to specified depth."""
@@ -254,12 +294,8 @@ class FileTreeView(QWidget):
             
     def get_selected_token_count(self) -> int:
         """Get total token count for selected/checked items."""
-        total_tokens = 0
-        for path in self.get_checked_paths():
-            node = self.model.get_node_by_path(path)
-            if node and not node.is_dir:
-                total_tokens += node.token_count
-        return total_tokens
+        # The invisible root carries the aggregated selection sum
+        return self.model.root_node.selected_tokens
         
     def update_folder_token_display(self):
         """Update token display for all folders."""
@@ -273,10 +309,14 @@ class FileTreeView(QWidget):
         self.populate_tree(items, root_path)
         
     # File system event handling
-    def update_from_fs_events(self, event_batch: List):
-        """Handle file system events by delegating to the underlying model."""
+    def update_from_fs_events(self, event_batch: List) -> dict:
+        """Handle file system events by delegating to the underlying model.
+
+        Returns the model's {path: token_delta} dict for the batch.
+        """
         if self.model:
-            self.model.handle_fs_events(event_batch)
+            return self.model.handle_fs_events(event_batch)
+        return {}
         
     # Compatibility methods for existing TreePanel interface
     def setUpdatesEnabled(self, enabled: bool):
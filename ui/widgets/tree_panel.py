@@ -2,23 +2,40 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QTreeWidget, QLabel, QHeaderView, 
     QTreeWidgetItem, QTreeWidgetItemIterator, QStyle
 )
-from PySide6.QtCore import Qt, Signal, Slot, QTimer
+from PySide6.QtCore import Qt, Signal, Slot, QTimer, QSignalBlocker
 from PySide6.QtGui import QColor, QIcon
 
 import os
-import pathlib
 import time
+from collections import deque
 
 # Assuming these helpers will be available from the core module
 from core.helpers import TIKTOKEN_AVAILABLE, get_tokenizer
+from core.tokenizer import count_tokens
+from .tree_panel_mv import signal_has_receivers
+
+
+def _parent_path(path):
+    """Parent of a '/'-normalized path; str.rpartition is much cheaper than os.path.dirname."""
+    return path.rpartition('/')[0]
+
+
+def _base_name(path):
+    """Last component of a '/'-normalized path."""
+    return path.rpartition('/')[2] or path
 
 class TreePanel(QWidget):
-    """A widget that encapsulates the file/folder tree view and its logic."""
+    """A widget that encapsulates the file/folder tree view and its logic.
+
+    Legacy QTreeWidget implementation, kept for A/B comparison only. The app
+    uses TreePanelMV (QTreeView over FileTreeModel) via create_tree_panel().
+    """
     
     # Signals to communicate with the main window
     selection_changed = Signal()
     item_checked_changed = Signal()
     file_tokens_changed = Signal(str, int) # path, token_diff
+    file_tokens_changed_batch = Signal(dict)  # {path: token_delta}, once per fs event batch
     root_path_changed = Signal(str) # root_path
 
     # Constants for data roles
@@ -34,6 +51,7 @@ class TreePanel(QWidget):
         self.tokenizer = get_tokenizer()
         self._pending_tree_restore_paths = set()
         self.root_path = None
+        self._norm_cache = {}  # raw path -> normalized forward-slash path
         
         # Batching variables for non-blocking tree population
         # Initialize batching variables with dynamic sizing
@@ -98,19 +116,21 @@ class TreePanel(QWidget):
             return
 
         self._is_programmatically_checking = True
+        # itemChanged would otherwise fire once per descendant touched below
+        blocker = QSignalBlocker(self.tree_widget)
         try:
             state = item.checkState(0)
-            # Propagate state down to children
-            def set_children_check_state(item, state):
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    if child.checkState(0) != state:
-                        child.setCheckState(0, state)
-                    if child.childCount() > 0:
-                        set_children_check_state(child, state)
-
+            # Propagate state down to children in one iterative sweep
             if item.data(0, self.IS_DIR_ROLE):
-                set_children_check_state(item, state)
+                pending = deque([item])
+                while pending:
+                    folder = pending.popleft()
+                    for i in range(folder.childCount()):
+                        child = folder.child(i)
+                        if child.checkState(0) != state:
+                            child.setCheckState(0, state)
+                        if child.childCount() > 0:
+                            pending.append(child)
 
             # Propagate state up to parents
             parent = item.parent()
@@ -129,6 +149,7 @@ class TreePanel(QWidget):
 
                 parent = parent.parent()
         finally:
+            blocker.unblock()
             self._is_programmatically_checking = False
             self.item_checked_changed.emit()
 
@@ -160,17 +181,19 @@ class TreePanel(QWidget):
             else:
                 paths_to_check = set(paths)
 
-            iterator = QTreeWidgetItemIterator(self.tree_widget)
-            while iterator.value():
-                item = iterator.value()
-                item_path = item.data(0, self.PATH_DATA_ROLE)
-                if item_path in paths_to_check:
-                    if item.checkState(0) != Qt.CheckState.Checked:
-                        item.setCheckState(0, Qt.CheckState.Checked)
-                else:
-                    if item.checkState(0) != Qt.CheckState.Unchecked:
-                         item.setCheckState(0, Qt.CheckState.Unchecked)
-                iterator += 1
+            # Every state is set explicitly here, so itemChanged stays silent for the pass
+            with QSignalBlocker(self.tree_widget):
+                iterator = QTreeWidgetItemIterator(self.tree_widget)
+                while iterator.value():
+                    item = iterator.value()
+                    item_path = item.data(0, self.PATH_DATA_ROLE)
+                    if item_path in paths_to_check:
+                        if item.checkState(0) != Qt.CheckState.Checked:
+                            item.setCheckState(0, Qt.CheckState.Checked)
+                    else:
+                        if item.checkState(0) != Qt.CheckState.Unchecked:
+                             item.setCheckState(0, Qt.CheckState.Unchecked)
+                    iterator += 1
         finally:
             self._is_programmatically_checking = False
         
@@ -208,7 +231,8 @@ class TreePanel(QWidget):
         clear_time = (time.time() - self._tree_start_time) * 1000
         print(f"[TREE_PANEL] 🧽 Tree cleared (T+{clear_time:.2f}ms)")
         
-        self.root_path = os.path.normpath(root_path).replace('\\', '/')
+        self._norm_cache.clear()
+        self.root_path = self._norm(root_path)
         
         # Store items for batched processing and pre-calculate token data
         self._pending_items = items.copy()
@@ -221,14 +245,14 @@ class TreePanel(QWidget):
         
         # Extract token data from BG_scanner results
         for path_str, is_dir, rel_path, file_size, tokens in items:
-            norm_path = os.path.normpath(path_str).replace('\\', '/')
+            norm_path = self._norm(path_str)
             if not is_dir and tokens > 0:
                 self._token_data[norm_path] = tokens
                 # Also accumulate folder tokens
-                folder_path = os.path.dirname(norm_path)
+                folder_path = _parent_path(norm_path)
                 while folder_path and folder_path != self.root_path:
                     self._folder_tokens[folder_path] = self._folder_tokens.get(folder_path, 0) + tokens
-                    folder_path = os.path.dirname(folder_path)
+                    folder_path = _parent_path(folder_path)
                 # Add to root folder
                 self._folder_tokens[self.root_path] = self._folder_tokens.get(self.root_path, 0) + tokens
         
@@ -248,14 +272,7 @@ class TreePanel(QWidget):
         # Pre-calculate all required directories for batched processing
         calc_start_time = (time.time() - self._tree_start_time) * 1000
         print(f"[TREE_PANEL] 📁 Pre-calculating directory structure... (T+{calc_start_time:.2f}ms)")
-        self._all_required_dirs = {self.root_path}
-        for path_str, is_dir, _, _, _ in self._pending_items:
-            norm_path = os.path.normpath(path_str).replace('\\', '/')
-            path_to_ascend = norm_path if is_dir else os.path.dirname(norm_path)
-            p = pathlib.Path(path_to_ascend)
-            while p and str(p) != self.root_path and len(str(p)) >= len(self.root_path):
-                self._all_required_dirs.add(str(p).replace('\\', '/'))
-                p = p.parent
+        self._all_required_dirs = self._collect_required_dirs(self._pending_items)
         
         # Convert to sorted list for batched processing
         self._sorted_dirs = sorted(list(self._all_required_dirs))
@@ -293,7 +310,7 @@ class TreePanel(QWidget):
             for i in range(self._dir_index, batch_end):
                 dir_path = self._sorted_dirs[i]
                 if dir_path not in self.tree_items:
-                    parent_path = os.path.dirname(dir_path)
+                    parent_path = _parent_path(dir_path)
                     parent_item = self.tree_items.get(parent_path, self.tree_widget.invisibleRootItem())
                     self._add_item_to_tree(parent_item, dir_path, True, True, '', 0)
             
@@ -321,8 +338,8 @@ class TreePanel(QWidget):
                 path_str, is_dir, is_valid, reason, token_count = self._pending_items[i]
                 
                 if not is_dir:  # Only process files in this phase
-                    norm_path = os.path.normpath(path_str).replace('\\', '/')
-                    parent_path = os.path.dirname(norm_path)
+                    norm_path = self._norm(path_str)
+                    parent_path = _parent_path(norm_path)
                     parent_item = self.tree_items.get(parent_path, self.tree_widget.invisibleRootItem())
                     self._add_item_to_tree(parent_item, norm_path, False, is_valid, reason, token_count)
             
@@ -395,7 +412,8 @@ class TreePanel(QWidget):
     def populate_tree_optimistic(self, items, root_path):
         """Optimistically populate tree with immediate display and loading states."""
         self.clear_tree()
-        self.root_path = os.path.normpath(root_path).replace('\\', '/')
+        self._norm_cache.clear()
+        self.root_path = self._norm(root_path)
         self.tree_widget.setUpdatesEnabled(False)
         
         # Hide main loading label, show tree immediately
@@ -407,26 +425,18 @@ class TreePanel(QWidget):
         )
 
         # Step 1: Collect all directory paths that need to exist.
-        all_required_dirs = {self.root_path}
-        files_with_loading_tokens = []
-        
-        for path_str, is_dir, _, _, token_count in items:
-            norm_path = os.path.normpath(path_str).replace('\\', '/')
-            path_to_ascend = norm_path if is_dir else os.path.dirname(norm_path)
-            p = pathlib.Path(path_to_ascend)
-            while p and str(p) != self.root_path and len(str(p)) >= len(self.root_path):
-                all_required_dirs.add(str(p).replace('\\', '/'))
-                p = p.parent
-                
-            # Track files that need token loading
-            if not is_dir and token_count == -1:
-                files_with_loading_tokens.append(norm_path)
+        all_required_dirs = self._collect_required_dirs(items)
+        # Track files that need token loading
+        files_with_loading_tokens = [
+            self._norm(path_str) for path_str, is_dir, _, _, token_count in items
+            if not is_dir and token_count == -1
+        ]
 
         # Step 2: Create all directory items
         for dir_path in sorted(list(all_required_dirs)):
             if dir_path == self.root_path or dir_path in self.tree_items:
                 continue
-            parent_path = os.path.dirname(dir_path)
+            parent_path = _parent_path(dir_path)
             parent_item = self.tree_items.get(parent_path)
             if parent_item:
                 self._add_item_to_tree(parent_item, dir_path, True, True, '', 0)
@@ -434,8 +444,8 @@ class TreePanel(QWidget):
         # Step 3: Create all file items with loading states
         for path_str, is_dir, is_valid, reason, token_count in items:
             if not is_dir:
-                norm_path = os.path.normpath(path_str).replace('\\', '/')
-                parent_path = os.path.dirname(norm_path)
+                norm_path = self._norm(path_str)
+                parent_path = _parent_path(norm_path)
                 parent_item = self.tree_items.get(parent_path)
                 if parent_item:
                     # Show "Loading..." for files with token_count = -1
@@ -513,8 +523,7 @@ class TreePanel(QWidget):
         checked_absolute_paths = self.get_checked_paths(return_set=True, relative=False)
 
         for path_str in sorted(list(checked_absolute_paths)):
-            path_obj = pathlib.Path(path_str)
-            if not path_obj.is_file():
+            if not os.path.isfile(path_str):
                 continue
 
             try:
@@ -529,7 +538,7 @@ class TreePanel(QWidget):
 
                 # 3. Append the file’s actual content
                 # Note: MAX_FILE_SIZE_BYTES is not defined, so reading the whole file.
-                with open(path_obj, 'r', encoding='utf-8', errors='replace') as f:
+                with open(path_str, 'r', encoding='utf-8', errors='replace') as f:
                     content = f.read()
                 
                 # Sanitize content to avoid breaking the markdown block
@@ -554,30 +563,35 @@ class TreePanel(QWidget):
         if not TIKTOKEN_AVAILABLE: return
         self.tree_widget.setUpdatesEnabled(False)
         try:
-            iterator = QTreeWidgetItemIterator(self.tree_widget, QTreeWidgetItemIterator.IteratorFlag.All)
-            while iterator.value():
-                item = iterator.value()
-                # Check if it's a folder (has children or was marked as a directory)
-                if item.data(0, self.IS_DIR_ROLE):
-                    # Calculate selected tokens directly using BG_scanner token data
-                    selected_tokens = 0
-                    folder_iterator = QTreeWidgetItemIterator(item)
-                    while folder_iterator.value():
-                        child_item = folder_iterator.value()
+            # One post-order pass: each folder's selected tokens are the sum of its
+            # children's, instead of re-iterating every folder's whole subtree.
+            # Frames are [folder, next child index, selected tokens so far].
+            stack = [[self.tree_widget.invisibleRootItem(), 0, 0]]
+            while stack:
+                frame = stack[-1]
+                folder, index = frame[0], frame[1]
+                if index < folder.childCount():
+                    frame[1] += 1
+                    child = folder.child(index)
+                    if child.data(0, self.IS_DIR_ROLE):
+                        stack.append([child, 0, 0])
+                    elif child.checkState(0) == Qt.CheckState.Checked:
                         # Add tokens only for checked files
-                        if (child_item and not child_item.data(0, self.IS_DIR_ROLE) and 
-                            child_item.checkState(0) == Qt.CheckState.Checked):
-                            selected_tokens += child_item.data(0, self.TOKEN_COUNT_ROLE) or 0
-                        folder_iterator += 1
-                    
-                    total_tokens = item.data(0, self.TOKEN_COUNT_ROLE) or 0
-                    item.setText(1, f"{selected_tokens:,} / {total_tokens:,} tokens")
-                iterator += 1
+                        frame[2] += child.data(0, self.TOKEN_COUNT_ROLE) or 0
+                    continue
+
+                stack.pop()
+                folder_selected = frame[2]
+                if stack:
+                    stack[-1][2] += folder_selected
+                    total_tokens = folder.data(0, self.TOKEN_COUNT_ROLE) or 0
+                    folder.setText(1, f"{folder_selected:,} / {total_tokens:,} tokens")
         finally:
             self.tree_widget.setUpdatesEnabled(True)
 
     @Slot(list)
     def update_from_fs_events(self, event_batch):
+        token_deltas = {}
         self.tree_widget.setUpdatesEnabled(False)
         try:
             for event in event_batch:
@@ -587,29 +601,35 @@ class TreePanel(QWidget):
                 if action == 'created':
                     if src_path in self.tree_items or not os.path.exists(src_path):
                         continue
-                    parent_path = os.path.dirname(src_path)
+                    parent_path = _parent_path(src_path)
                     parent_item = self.tree_items.get(parent_path)
                     if parent_item:
                         is_dir = os.path.isdir(src_path)
                         # This part might need adjustment based on how tokens are calculated for new files
                         token_count = 0 if is_dir else count_tokens(src_path)
                         self._add_item_to_tree(parent_item, src_path, is_dir, True, '', token_count)
+                        if token_count:
+                            token_deltas[src_path] = token_count
 
                 elif action == 'deleted':
-                    if src_path not in self.tree_items:
+                    # A single pop: the path may already be gone after an earlier event
+                    item_to_remove = self.tree_items.pop(src_path, None)
+                    if item_to_remove is None:
                         continue
-                    item_to_remove = self.tree_items.pop(src_path)
+                    removed_tokens = item_to_remove.data(0, self.TOKEN_COUNT_ROLE)
+                    if not item_to_remove.data(0, self.IS_DIR_ROLE) and removed_tokens and removed_tokens > 0:
+                        token_deltas[src_path] = -removed_tokens
                     parent = item_to_remove.parent()
-                    if parent:
+                    if parent is not None:
                         parent.removeChild(item_to_remove)
 
                 elif action == 'moved':
                     dst_path = os.path.normpath(event['dst_path']).replace('\\', '/')
-                    if src_path not in self.tree_items:
+                    item = self.tree_items.pop(src_path, None)
+                    if item is None:
                         continue
 
-                    item = self.tree_items.pop(src_path)
-                    item.setText(0, os.path.basename(dst_path))
+                    item.setText(0, _base_name(dst_path))
                     item.setData(0, self.PATH_DATA_ROLE, dst_path)
                     self.tree_items[dst_path] = item
 
@@ -618,7 +638,7 @@ class TreePanel(QWidget):
                         self._recursive_update_child_paths(item, src_path, dst_path)
 
                     # Check if parent needs to be changed
-                    new_parent_path = os.path.dirname(dst_path)
+                    new_parent_path = _parent_path(dst_path)
                     old_parent_item = item.parent()
                     if old_parent_item and old_parent_item.data(0, self.PATH_DATA_ROLE) != new_parent_path:
                         new_parent_item = self.tree_items.get(new_parent_path, self.tree_widget.invisibleRootItem())
@@ -630,6 +650,13 @@ class TreePanel(QWidget):
             self.update_folder_token_display()
             self.item_checked_changed.emit()
 
+        # One batch signal for the whole event batch, as in TreePanelMV
+        if token_deltas:
+            self.file_tokens_changed_batch.emit(token_deltas)
+            if not signal_has_receivers(self, 'file_tokens_changed_batch'):
+                for path, delta in token_deltas.items():
+                    self.file_tokens_changed.emit(path, delta)
+
     def _recursive_update_child_paths(self, item, old_base, new_base):
         """Recursively update the paths of child items when a directory is moved."""
         for i in range(item.childCount()):
@@ -647,10 +674,31 @@ class TreePanel(QWidget):
 
     # --- Private Helper Methods ---
 
+    def _norm(self, path):
+        """Normalize a path to forward slashes, memoized per raw path string."""
+        norm_path = self._norm_cache.get(path)
+        if norm_path is None:
+            norm_path = os.path.normpath(path).replace('\\', '/')
+            self._norm_cache[path] = norm_path
+        return norm_path
+
+    def _collect_required_dirs(self, items):
+        """Return every folder between root_path and the given items, root included."""
+        required_dirs = {self.root_path}
+        root_len = len(self.root_path)
+        for path_str, is_dir, _, _, _ in items:
+            norm_path = self._norm(path_str)
+            p = norm_path if is_dir else _parent_path(norm_path)
+            # Walk up by slicing at '/' - stop once an ancestor is already known
+            while len(p) > root_len and p not in required_dirs:
+                required_dirs.add(p)
+                p = _parent_path(p)
+        return required_dirs
+
     def _add_item_to_tree(self, parent_item, path_str, is_dir, is_valid, reason, token_count):
-        norm_path = os.path.normpath(path_str).replace('\\', '/')
+        norm_path = self._norm(path_str)
         item = QTreeWidgetItem(parent_item or self.tree_widget.invisibleRootItem())
-        item.setText(0, os.path.basename(path_str))
+        item.setText(0, _base_name(norm_path))
         item.setData(0, self.PATH_DATA_ROLE, norm_path)
         item.setData(0, self.IS_DIR_ROLE, is_dir)
         item.setIcon(0, self.folder_icon if is_dir else self.file_icon)
@@ -6,10 +6,26 @@ This provides a drop-in replacement for the existing TreePanel with dramatically
 import os
 import time
 from typing import List, Set, Optional, Union
-from PySide6.QtCore import QTimer, Qt, Signal, QModelIndex
+from PySide6.QtCore import QTimer, Qt, Signal, Slot, QModelIndex, QMetaMethod
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 
 from .file_tree_view import FileTreeView
+from ..models.file_tree_model import TreeItemsView
+
+
+def signal_has_receivers(obj, signal_name: str) -> bool:
+    """Whether any slot is connected to obj's signal of that name.
+
+    Looked up through the meta-object, so no C++ signature string is needed
+    for signals declared with Python types (Signal(dict)).
+    """
+    meta = obj.metaObject()
+    name = signal_name.encode()
+    for i in range(meta.methodCount()):
+        method = meta.method(i)
+        if method.methodType() == QMetaMethod.MethodType.Signal and bytes(method.name()) == name:
+            return obj.isSignalConnected(method)
+    return False
 
 
 class TreePanelMV(QWidget):
@@ -23,6 +39,7 @@ class TreePanelMV(QWidget):
     selection_changed = Signal()
     item_checked_changed = Signal()
     file_tokens_changed = Signal(str, int)
+    file_tokens_changed_batch = Signal(dict)  # {path: token_delta}, once per fs event batch
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -87,9 +104,6 @@ class TreePanelMV(QWidget):
         view_time = (time.time() - view_start) * 1000
         print(f"[TREE_PANEL] 🌳 View population took {view_time:.2f}ms")
         
-        # Expand root level
-        self.file_tree_view.expand_to_depth(0)
-        
         # Fix #2: Selection Timing Correction - finalize tree population
         self._finalize_tree_population()
         
@@ -117,6 +131,20 @@ class TreePanelMV(QWidget):
         else:
             print(f"[SELECT] ℹ️ No pending paths to restore")
         
+    def _relative_to_root(self, path: str, root_path: Optional[str] = None) -> str:
+        """
+        Path relative to the tree root, like os.path.relpath.
+        Tree paths are '/'-normalized, so a path under the root is just sliced
+        after the root prefix; anything else goes through os.path.relpath.
+        """
+        root = self.root_path.rstrip('/')
+        if path == root:
+            return '.'
+        if root and path.startswith(root) and path[len(root)] == '/':
+            relative_path = path[len(root) + 1:]
+            return relative_path.replace('/', os.sep) if os.sep != '/' else relative_path
+        return os.path.relpath(path, root_path or self.root_path)
+
     def _normalize_path_for_cache(self, path: str) -> str:
         """Normalize path for consistent cache lookup."""
         try:
@@ -157,24 +185,6 @@ class TreePanelMV(QWidget):
         """Get the direct token cache for external access."""
         return getattr(self, '_token_cache', {})
         
-    def get_checked_paths(self, return_set: bool = False, relative: bool = False):
-        """Get list or set of checked file paths."""
-        checked_paths = self.file_tree_view.get_checked_paths()
-
-        # Convert to relative paths if requested
-        if relative and self.root_path:
-            relative_paths = []
-            for path in checked_paths:
-                try:
-                    rel_path = os.path.relpath(path, self.root_path)
-                    relative_paths.append(rel_path)
-                except ValueError:
-                    # If can't make relative, use original path
-                    relative_paths.append(path)
-            checked_paths = relative_paths
-            
-        return set(checked_paths) if return_set else checked_paths
-        
     def set_checked_paths(self, paths: Union[List[str], Set[str]], relative: bool = False):
         """Set checked paths in the tree, converting to absolute if needed.
         
@@ -213,10 +223,9 @@ class TreePanelMV(QWidget):
     def update_file_token_count(self, file_path: str, token_count: int):
         """Update token count for a specific file (compatibility method)."""
         node = self.file_tree_view.model.get_node_by_path(file_path)
-        if node:
-            node.token_count = token_count
-            # Trigger model update
-            self.file_tree_view.model.dataChanged.emit(QModelIndex(), QModelIndex())
+        if node and not node.is_dir:
+            # Model rolls the difference up to the folder totals
+            self.file_tree_view.model.set_file_token_count(node, token_count)
             
     def update_file_validation(self, file_path: str, is_valid: bool, reason: str):
         """Update validation status for a specific file (compatibility method)."""
@@ -238,9 +247,20 @@ class TreePanelMV(QWidget):
         self.populate_tree(items, root_path)
         
     # File system event handling
+    def handle_fs_events(self, event_batch: List):
+        """Apply a watcher event batch (same entry point as the QTreeWidget TreePanel)."""
+        self.update_from_fs_events(event_batch)
+
+    @Slot(list)
     def update_from_fs_events(self, event_batch: List):
         """Handle file system events."""
-        self.file_tree_view.update_from_fs_events(event_batch)
+        token_deltas = self.file_tree_view.update_from_fs_events(event_batch)
+        if token_deltas:
+            self.file_tokens_changed_batch.emit(token_deltas)
+            # Per-file signal only for listeners that have not moved to the batch signal
+            if not signal_has_receivers(self, 'file_tokens_changed_batch'):
+                for path, delta in token_deltas.items():
+                    self.file_tokens_changed.emit(path, delta)
         # Keep the token cache in sync with filesystem changes to avoid
         # stale entries leaking into aggregation logic.
         if not hasattr(self, '_token_cache'):
@@ -291,23 +311,9 @@ class TreePanelMV(QWidget):
         Returns:
             List or set of checked file paths
         """
-        # Delegate to the model's get_checked_paths method
-        checked_paths = self.file_tree_view.model.get_checked_paths()
-        
-        if not relative or not self.root_path:
-            return set(checked_paths) if return_set else checked_paths
-            
-        # Convert to relative paths
-        relative_paths = []
-        for path in checked_paths:
-            try:
-                rel_path = os.path.relpath(path, self.root_path)
-                relative_paths.append(rel_path)
-            except (ValueError, OSError):
-                # If relative path conversion fails, use the original path
-                relative_paths.append(path)
-                
-        return set(relative_paths) if return_set else relative_paths
+        # Delegate to the model; relative paths are built from cached folder prefixes
+        checked_paths = self.file_tree_view.model.get_checked_paths(relative=bool(relative and self.root_path))
+        return set(checked_paths) if return_set else checked_paths
         
     def get_aggregated_content(self):
         """Aggregates content from checked files using the specified format."""
@@ -336,7 +342,7 @@ class TreePanelMV(QWidget):
                 
                 # Calculate relative path once
                 try:
-                    relative_path_str = os.path.relpath(path_str, root_path_normalized)
+                    relative_path_str = self._relative_to_root(path_str, root_path_normalized)
                 except ValueError:
                     # Fallback if relpath fails (different drives on Windows)
                     relative_path_str = os.path.basename(path_str)
@@ -420,7 +426,7 @@ class TreePanelMV(QWidget):
                 for node in unique_nodes:
                     if self.root_path and node.path.startswith(self.root_path):
                         try:
-                            relative_path = os.path.relpath(node.path, self.root_path)
+                            relative_path = self._relative_to_root(node.path)
                             # Handle root directory case
                             if relative_path == '.':
                                 relative_path = '[ROOT]'
@@ -461,6 +467,11 @@ class TreePanelMV(QWidget):
             print(f"[SELECTION STATUS] Error logging files: {e}")
             
     # Properties for compatibility
+    @property
+    def tree_items(self) -> TreeItemsView:
+        """Path -> item handle mapping backed by the model (no per-node QObjects)."""
+        return TreeItemsView(self.file_tree_view.model)
+
     @property
     def tree_widget(self):
         """Get the underlying tree widget (for compatibility)."""
@@ -476,6 +487,10 @@ def create_tree_panel(use_model_view: bool = True, parent=None):
     """
     Factory function to create either the old TreePanel or new Model/View TreePanel.
     This allows for easy A/B testing and gradual migration.
+
+    The Model/View panel is the default: QTreeView only lays out visible rows and
+    FileTreeModel resets once per population, whereas the legacy QTreeWidget
+    allocates a QTreeWidgetItem per node.
     """
     if use_model_view:
         return TreePanelMV(parent)